@@ -1,19 +1,37 @@
 import csv
+import codecs
 import gspread
 import time
 import warnings
 import os
 import sys
 import json
+import sqlite3
+import mmap
+import hashlib
+import re
 import threading
 import tempfile
 import shutil
-from collections import defaultdict
-from datetime import datetime
+import numpy as np
+from abc import ABC, abstractmethod
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import closing, contextmanager
+from datetime import date, datetime, timezone
+from email.utils import parsedate_to_datetime
 from gspread_formatting import *
-from gspread.utils import rowcol_to_a1
+from gspread.exceptions import APIError
+from gspread.http_client import HTTPClient
+from gspread.utils import (
+    ValueRenderOption,
+    a1_range_to_grid_range,
+    rowcol_to_a1,
+)
+from google.auth.transport.requests import AuthorizedSession
 from google.oauth2 import service_account
-from flask import Flask, request, render_template
+from flask import Flask, Response, request, render_template
+from requests.adapters import HTTPAdapter
 from werkzeug.utils import secure_filename
 
 warnings.filterwarnings("ignore", category=DeprecationWarning)
@@ -22,8 +40,6 @@ app = Flask(__name__,
             static_folder='static')
 app.config["SECRET_KEY"] = os.environ.get("SECRET_KEY", "dev-secret-key-123")
 
-OPERATION_STATUS = {}
-
 DAILY_NORMS = {
     "Rent": 50.0,
     "Gym": 3.0,
@@ -37,6 +53,94 @@ DAILY_NORMS = {
 
 ALLOWED_EXTENSIONS = {"csv", "txt"}
 
+# Smallest byte range worth handing to a separate parsing process
+PARALLEL_MIN_RANGE_BYTES = 1024 * 1024
+# Leading bytes of a file that decide its encoding
+ENCODING_SNIFF_BYTES = 64 * 1024
+
+# On-disk cache of parsed uploads, keyed by content hash and rules version
+UPLOAD_CACHE_DIR = os.environ.get(
+    "UPLOAD_CACHE_DIR",
+    os.path.join(tempfile.gettempdir(), "finance_manager_uploads"),
+)
+UPLOAD_CACHE_MAX_BYTES = int(
+    os.environ.get("UPLOAD_CACHE_MAX_BYTES", 256 * 1024 * 1024)
+)
+
+# Stored per-month transactions and totals used by append uploads, and
+# the default home of the status, index and write-queue databases. It has
+# to outlive restarts; on hosts with an ephemeral filesystem point it at a
+# mounted volume
+MONTH_STATE_DIR = os.environ.get(
+    "MONTH_STATE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "state"),
+)
+
+# Operation statuses shared by the worker processes of a host; entries
+# expire STATUS_TTL seconds after their last update
+STATUS_DB_PATH = os.environ.get(
+    "STATUS_DB_PATH",
+    os.path.join(MONTH_STATE_DIR, "status.sqlite3"),
+)
+STATUS_TTL = float(os.environ.get("STATUS_TTL", 6 * 60 * 60))
+# A repeat upload of the same file for the same month follows the running
+# job, or one that succeeded less than JOB_DEDUP_WINDOW seconds ago
+JOB_DEDUP_WINDOW = float(os.environ.get("JOB_DEDUP_WINDOW", 10 * 60))
+# Processes refresh the operations they work on every
+# JOB_HEARTBEAT_INTERVAL seconds; a running operation without a refresh
+# for JOB_STALE_AFTER seconds is taken as lost (e.g. after a restart)
+JOB_HEARTBEAT_INTERVAL = float(os.environ.get("JOB_HEARTBEAT_INTERVAL", 60))
+JOB_STALE_AFTER = float(os.environ.get("JOB_STALE_AFTER", 5 * 60))
+
+# A status stream re-reads the store at least every STATUS_STREAM_POLL
+# seconds and ends after STATUS_STREAM_TIMEOUT; browsers then reconnect.
+# Each open stream holds a worker thread, so a process serves at most
+# STATUS_STREAM_MAX of them and further browsers fall back to polling
+STATUS_STREAM_POLL = float(os.environ.get("STATUS_STREAM_POLL", 5))
+STATUS_STREAM_TIMEOUT = float(os.environ.get("STATUS_STREAM_TIMEOUT", 90))
+STATUS_STREAM_MAX = int(os.environ.get("STATUS_STREAM_MAX", 3))
+STATUS_STREAM_SLOTS = threading.BoundedSemaphore(max(STATUS_STREAM_MAX, 1))
+
+# Identity index of already ingested transactions, used to de-duplicate
+TRANSACTION_INDEX_PATH = os.environ.get(
+    "TRANSACTION_INDEX_PATH",
+    os.path.join(MONTH_STATE_DIR, "transactions.sqlite3"),
+)
+
+# Durable queue of pending month-sheet and SUMMARY writes
+WRITE_QUEUE_PATH = os.environ.get(
+    "WRITE_QUEUE_PATH",
+    os.path.join(MONTH_STATE_DIR, "sheet_writes.sqlite3"),
+)
+WRITE_QUEUE_MAX_ATTEMPTS = int(os.environ.get("WRITE_QUEUE_MAX_ATTEMPTS", 5))
+# Queued writes run at the same time, at most one of each kind
+SHEET_WRITE_WORKERS = int(os.environ.get("SHEET_WRITE_WORKERS", 2))
+
+# Background analysis jobs per process and how many may wait for a worker
+ANALYSIS_WORKERS = int(os.environ.get("ANALYSIS_WORKERS", 2))
+ANALYSIS_BACKLOG = int(os.environ.get("ANALYSIS_BACKLOG", 8))
+
+# Where month layouts and SUMMARY columns go: "sheets", "csv" or "sqlite";
+# the local sinks write below OUTPUT_DIR
+OUTPUT_SINKS = ("sheets", "csv", "sqlite")
+OUTPUT_SINK = os.environ.get("OUTPUT_SINK", "sheets")
+OUTPUT_DIR = os.environ.get("OUTPUT_DIR", "reports")
+
+# Cached SUMMARY header layouts by worksheet id; edits made outside the
+# app are picked up once the TTL expires
+SUMMARY_LAYOUTS = {}
+SUMMARY_LAYOUT_LOCK = threading.Lock()
+SUMMARY_LAYOUT_TTL = float(os.environ.get("SUMMARY_LAYOUT_TTL", 300))
+# Serializes new SUMMARY columns across the worker processes of a host
+SUMMARY_LOCK_PATH = os.environ.get(
+    "SUMMARY_LOCK_PATH",
+    os.path.join(MONTH_STATE_DIR, "summary.lock"),
+)
+
+# "diff" rewrites only the changed cells of an existing month sheet,
+# "full" clears and repaints it
+MONTH_SHEET_SYNC = os.environ.get("MONTH_SHEET_SYNC", "diff")
+
 
 def allowed_file(filename):
     """
@@ -69,6 +173,169 @@ def allowed_file(filename):
     return extension in ALLOWED_EXTENSIONS
 
 
+class TokenBucket:
+    """
+    Thread-safe token bucket holding capacity tokens per period seconds.
+    acquire() blocks only as long as needed for a token to refill; after a
+    rate-limit error throttle() empties the bucket and pauses refills for
+    the server's Retry-After delay, or doubles the pause on consecutive
+    errors up to one full period.
+    """
+
+    def __init__(self, capacity, period=60.0):
+        self.capacity = max(int(capacity), 1)
+        self.period = float(period)
+        self.rate = self.capacity / self.period
+        self.waited = 0.0
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._strikes = 0
+        self._condition = threading.Condition()
+
+    def _refill(self, now):
+        start = max(self._updated, self._paused_until)
+        if now > start:
+            self._tokens = min(
+                self.capacity, self._tokens + (now - start) * self.rate
+            )
+        self._updated = max(self._updated, now)
+
+    def acquire(self, tokens=1):
+        """Take tokens, waiting if needed; returns the seconds waited"""
+        started = time.monotonic()
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    break
+                wait = max(self._paused_until - now, 0) + (
+                    (tokens - self._tokens) / self.rate
+                )
+                self._condition.wait(wait)
+
+            waited = time.monotonic() - started
+            self.waited += waited
+            return waited
+
+    def throttle(self, retry_after=None):
+        """Back off after a rate-limit error from the API"""
+        with self._condition:
+            self._strikes += 1
+            if retry_after is None:
+                pause = min(2 ** self._strikes, self.period)
+            else:
+                pause = retry_after
+            self._tokens = 0.0
+            self._paused_until = max(
+                self._paused_until, time.monotonic() + pause
+            )
+
+    def succeeded(self):
+        """Reset the back-off after a successful request"""
+        if self._strikes:
+            with self._condition:
+                self._strikes = 0
+
+
+def retry_after_seconds(response):
+    """Return the Retry-After delay of a response in seconds, or None"""
+    value = getattr(response, "headers", {}).get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        delay = parsedate_to_datetime(value) - datetime.now(timezone.utc)
+    except (TypeError, ValueError):
+        return None
+    return max(delay.total_seconds(), 0.0)
+
+
+# Process-wide limiters sized to the Sheets per-user per-minute quotas
+SHEETS_READ_LIMITER = TokenBucket(
+    os.environ.get("SHEETS_READS_PER_MINUTE", 60)
+)
+SHEETS_WRITE_LIMITER = TokenBucket(
+    os.environ.get("SHEETS_WRITES_PER_MINUTE", 60)
+)
+# Attempts of one Sheets write on rate-limit errors; with the limiter
+# pausing 2, 4, 8, 16 and 32 seconds in between, the last attempt only
+# runs once a whole per-minute quota window has passed
+SHEETS_MAX_RETRIES = int(os.environ.get("SHEETS_MAX_RETRIES", 6))
+
+
+class StageTimer:
+    """
+    Wall-clock time, Sheets API calls, rate-limited (429) responses and
+    token-bucket waits of one job stage. While a stage is entered on a
+    thread, RateLimitedHTTPClient charges that thread's requests to it.
+    """
+
+    active = threading.local()
+
+    def __init__(self, name):
+        self.name = name
+        self.seconds = 0.0
+        self.api_calls = 0
+        self.rate_limited = 0
+        self.limiter_wait = 0.0
+
+    @classmethod
+    def current(cls):
+        """Return the stage entered on this thread, or None"""
+        return getattr(cls.active, "stage", None)
+
+    def __enter__(self):
+        self.previous = self.current()
+        self.started = time.monotonic()
+        StageTimer.active.stage = self
+        return self
+
+    def __exit__(self, *exc_info):
+        self.seconds += time.monotonic() - self.started
+        StageTimer.active.stage = self.previous
+        return False
+
+    def stats(self):
+        return {
+            "seconds": round(self.seconds, 3),
+            "api_calls": self.api_calls,
+            "rate_limited": self.rate_limited,
+            "limiter_wait": round(self.limiter_wait, 3),
+        }
+
+
+class RateLimitedHTTPClient(HTTPClient):
+    """gspread HTTP client that takes a limiter token for every request"""
+
+    def request(self, method, endpoint, *args, **kwargs):
+        if method.upper() == "GET":
+            limiter = SHEETS_READ_LIMITER
+        else:
+            limiter = SHEETS_WRITE_LIMITER
+
+        waited = limiter.acquire()
+        stage = StageTimer.current()
+        if stage is not None:
+            stage.api_calls += 1
+            stage.limiter_wait += waited
+        try:
+            response = super().request(method, endpoint, *args, **kwargs)
+        except APIError as e:
+            if e.code == 429:
+                limiter.throttle(retry_after_seconds(e.response))
+                if stage is not None:
+                    stage.rate_limited += 1
+            raise
+        limiter.succeeded()
+        return response
+
+
 def get_google_credentials():
     """Get Google credentials with better error handling"""
     try:
@@ -114,31 +381,256 @@ def get_google_credentials():
         return None
 
 
+class SheetsClientPool:
+    """
+    Process-level pool for the authorized gspread client.
+    Credentials are loaded once and refreshed by the AuthorizedSession,
+    whose keep-alive connection pool is reused by every background job.
+    Spreadsheet and Worksheet handles are cached so repeat jobs skip the
+    lookup round trips.
+    """
+
+    def __init__(self, pool_maxsize=10):
+        self.pool_maxsize = pool_maxsize
+        self._client = None
+        self._spreadsheets = {}
+        self._worksheets = {}
+        self._lock = threading.RLock()
+
+    def client(self):
+        """Return the shared gspread client, or None without credentials"""
+        with self._lock:
+            if self._client is None:
+                creds = get_google_credentials()
+                if not creds:
+                    return None
+
+                session = AuthorizedSession(creds)
+                adapter = HTTPAdapter(
+                    pool_connections=2, pool_maxsize=self.pool_maxsize
+                )
+                session.mount("https://", adapter)
+                self._client = gspread.authorize(
+                    None, http_client=RateLimitedHTTPClient, session=session
+                )
+            return self._client
+
+    def open(self, title):
+        """Open a spreadsheet by title, reusing a cached handle"""
+        with self._lock:
+            key = ("title", title)
+            if key not in self._spreadsheets:
+                self._spreadsheets[key] = self.client().open(title)
+            return self._spreadsheets[key]
+
+    def open_by_key(self, spreadsheet_key):
+        """Open a spreadsheet by ID, reusing a cached handle"""
+        with self._lock:
+            key = ("key", spreadsheet_key)
+            if key not in self._spreadsheets:
+                self._spreadsheets[key] = self.client().open_by_key(
+                    spreadsheet_key
+                )
+            return self._spreadsheets[key]
+
+    def worksheet(self, spreadsheet, title):
+        """Return a worksheet handle; raises gspread.WorksheetNotFound"""
+        with self._lock:
+            key = (spreadsheet.id, title)
+            if key not in self._worksheets:
+                self._worksheets[key] = spreadsheet.worksheet(title)
+            return self._worksheets[key]
+
+    def remember_worksheet(self, spreadsheet, worksheet):
+        with self._lock:
+            self._worksheets[(spreadsheet.id, worksheet.title)] = worksheet
+
+    def forget_handles(self):
+        """Drop cached handles, e.g. after a sheet was changed elsewhere"""
+        with self._lock:
+            self._spreadsheets.clear()
+            self._worksheets.clear()
+
+    def reset(self):
+        """Drop the client and every cached handle"""
+        with self._lock:
+            self.forget_handles()
+            self._client = None
+
+
+SHEETS_POOL = SheetsClientPool()
+
+
+CATEGORY_RULES = {
+    "Salary": ["salary", "wages", "salary deposit"],
+    "Bonus": ["bonus", "tip", "reward"],
+    "Rent": ["rent", "monthly rent", "rent payment"],
+    "Store": ["supermarket", "grocery", "food"],
+    "Dining": ["restaurant", "cafe", "coffee"],
+    "Transport": ["bus", "train", "taxi", "uber", "fuel", "enoc"],
+    "Pastime": ["movie", "netflix", "concert", "spotify"],
+    "Services": ["electricity", "water", "gas", "internet", "phone"],
+    "Gym": ["gym", "fitness", "yoga"],
+    "Shopping": ["clothing", "electronics", "shopping"],
+    "Health": ["pharmacy", "doctor", "health", "dentist"],
+    "Insurance": ["insurance", "health insurance", "car insurance"],
+    "Travel": ["flight", "hotel", "travel", "airline", "hilton"],
+    "Other": [],
+}
+
+
+def compile_category_rules(rules):
+    """
+    Compile the keyword table into one alternation regex.
+    Keywords are ordered by category priority and wrapped in a lookahead,
+    so every start position reports its highest-priority keyword and the
+    lowest category rank over all positions wins, as in the original
+    first-category-wins scan. A first-character class lets the regex
+    engine skip positions where no keyword can start.
+    """
+    keyword_rank = {}
+    for rank, terms in enumerate(rules.values()):
+        for term in terms:
+            keyword_rank.setdefault(term.lower(), rank)
+
+    if not keyword_rank:
+        return None, keyword_rank, list(rules)
+
+    # Longer keywords first within a category so no alternative shadows
+    # a longer one of the same rank
+    ordered = sorted(keyword_rank, key=lambda t: (keyword_rank[t], -len(t)))
+    first_chars = "".join(sorted({re.escape(term[0]) for term in ordered}))
+    pattern = re.compile(
+        f"(?=[{first_chars}])"
+        "(?=(" + "|".join(re.escape(term) for term in ordered) + "))"
+    )
+    return pattern, keyword_rank, list(rules)
+
+
+def category_rules_version(rules):
+    """Return a short content hash identifying a set of category rules"""
+    payload = json.dumps(rules, sort_keys=False, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+CATEGORY_MATCHER = compile_category_rules(CATEGORY_RULES)
+CATEGORY_RULES_VERSION = category_rules_version(CATEGORY_RULES)
+
+
+class CategoryCache:
+    """
+    Bounded LRU memo of normalized description -> category.
+    Every clear() starts a new generation, and results computed under an
+    older generation are dropped instead of being stored.
+    """
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = max(int(maxsize), 0)
+        self.hits = 0
+        self.misses = 0
+        self.generation = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            category = self._entries.get(key)
+            if category is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return category
+
+    def put(self, key, category, generation):
+        with self._lock:
+            if generation != self.generation or self.maxsize == 0:
+                return
+            self._entries[key] = category
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def resize(self, maxsize):
+        with self._lock:
+            self.maxsize = max(int(maxsize), 0)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+        }
+
+
+CATEGORY_CACHE = CategoryCache(os.environ.get("CATEGORY_CACHE_SIZE", 4096))
+
+
+def set_category_rules(rules):
+    """Replace the category rules, recompile them and drop cached results"""
+    global CATEGORY_RULES, CATEGORY_MATCHER, CATEGORY_RULES_VERSION
+    matcher = compile_category_rules(rules)
+    CATEGORY_RULES = rules
+    CATEGORY_MATCHER = matcher
+    CATEGORY_RULES_VERSION = category_rules_version(rules)
+    CATEGORY_CACHE.clear()
+
+
+def match_category(desc):
+    """Run the compiled keyword rules on a lowercase description"""
+    pattern, keyword_rank, names = CATEGORY_MATCHER
+    if pattern is None:
+        return "Other"
+
+    best = None
+    for match in pattern.finditer(desc):
+        rank = keyword_rank[match.group(1)]
+        if best is None or rank < best:
+            best = rank
+            if rank == 0:
+                break
+
+    return names[best] if best is not None else "Other"
+
+
 def categorize(description):
     """Categorize transaction based on description."""
     desc = description.lower()
 
-    categories = {
-        "Salary": ["salary", "wages", "salary deposit"],
-        "Bonus": ["bonus", "tip", "reward"],
-        "Rent": ["rent", "monthly rent", "rent payment"],
-        "Store": ["supermarket", "grocery", "food"],
-        "Dining": ["restaurant", "cafe", "coffee"],
-        "Transport": ["bus", "train", "taxi", "uber", "fuel", "enoc"],
-        "Pastime": ["movie", "netflix", "concert", "spotify"],
-        "Services": ["electricity", "water", "gas", "internet", "phone"],
-        "Gym": ["gym", "fitness", "yoga"],
-        "Shopping": ["clothing", "electronics", "shopping"],
-        "Health": ["pharmacy", "doctor", "health", "dentist"],
-        "Insurance": ["insurance", "health insurance", "car insurance"],
-        "Travel": ["flight", "hotel", "travel", "airline", "hilton"],
-        "Other": [],
-    }
+    category = CATEGORY_CACHE.get(desc)
+    if category is not None:
+        return category
+
+    generation = CATEGORY_CACHE.generation
+    category = match_category(desc)
+    CATEGORY_CACHE.put(desc, category, generation)
+    return category
+
 
-    for cat, terms in categories.items():
-        if any(term in desc for term in terms):
-            return cat
-    return "Other"
+def categorize_many(descriptions):
+    """Categorize a batch of descriptions, scanning each distinct one once"""
+    seen = {}
+    result = []
+    for description in descriptions:
+        category = seen.get(description)
+        if category is None:
+            category = categorize(description)
+            seen[description] = category
+        result.append(category)
+    return result
 
 
 def get_month_column_name(month_input):
@@ -161,9 +653,9 @@ def get_month_column_name(month_input):
     return month_mapping.get(month, month)
 
 
-def analyze(transactions, daily_categories, month):
-    """Perform financial analysis with daily tracking"""
-    analysis = {
+def new_analysis(daily_categories, month):
+    """Return an empty analysis dict"""
+    return {
         "income": 0,
         "expenses": 0,
         "categories": defaultdict(float),
@@ -175,15 +667,9 @@ def analyze(transactions, daily_categories, month):
         "norms_violations": [],
     }
 
-    for t in transactions:
-        if t["type"] == "income":
-            analysis["income"] += t["amount"]
-            analysis["income_categories"][t["category"]] += t["amount"]
-        else:
-            analysis["expenses"] += abs(t["amount"])
-            analysis["categories"][t["category"]] += abs(t["amount"])
 
-    # Calculate daily averages
+def calculate_daily_averages(analysis):
+    """Fill daily averages, norms violations and savings of an analysis"""
     for category, total in analysis["categories"].items():
         daily_avg = total / analysis["days_count"]
         analysis["daily_averages"][category] = daily_avg
@@ -199,6 +685,83 @@ def analyze(transactions, daily_categories, month):
     return analysis
 
 
+def analyze(transactions, daily_categories, month):
+    """Perform financial analysis with daily tracking"""
+    if isinstance(transactions, TransactionStore):
+        return analyze_vectorized(
+            transactions.category_codes,
+            transactions.amounts,
+            transactions.type_codes,
+            transactions.categories,
+            daily_categories,
+            month,
+        )
+
+    analysis = new_analysis(daily_categories, month)
+
+    for t in transactions:
+        if t["type"] == "income":
+            analysis["income"] += t["amount"]
+            analysis["income_categories"][t["category"]] += t["amount"]
+        else:
+            analysis["expenses"] += abs(t["amount"])
+            analysis["categories"][t["category"]] += abs(t["amount"])
+
+    return calculate_daily_averages(analysis)
+
+
+def analyze_vectorized(
+    category_codes,
+    amounts,
+    type_codes,
+    category_names,
+    daily_categories,
+    month
+):
+    """
+    Perform the same analysis as analyze() on column arrays.
+    Totals are computed with grouped np.bincount sums, which accumulate
+    in row order, so the results match the row-by-row engine exactly.
+    """
+    analysis = new_analysis(daily_categories, month)
+
+    category_codes = np.asarray(category_codes, dtype=np.intp)
+    amounts = np.asarray(amounts, dtype=np.float64)
+    is_income = np.asarray(type_codes) == TransactionStore.TYPES.index(
+        "income"
+    )
+    if not len(amounts):
+        return calculate_daily_averages(analysis)
+
+    # Income keeps its sign, expenses are counted as absolute values
+    signed = np.where(is_income, amounts, np.abs(amounts))
+    type_totals = np.bincount(
+        is_income.astype(np.intp), weights=signed, minlength=2
+    )
+
+    # Group by (type, category) in one bincount
+    n_categories = len(category_names)
+    group_keys = is_income * n_categories + category_codes
+    group_totals = np.bincount(
+        group_keys, weights=signed, minlength=2 * n_categories
+    )
+
+    # Keep categories in order of first appearance, like analyze()
+    keys, first_seen = np.unique(group_keys, return_index=True)
+    for key in keys[np.argsort(first_seen, kind="stable")]:
+        income_group, code = divmod(int(key), n_categories)
+        name = category_names[code]
+        target = "income_categories" if income_group else "categories"
+        analysis[target][name] = float(group_totals[key])
+
+    if is_income.any():
+        analysis["income"] = float(type_totals[1])
+    if not is_income.all():
+        analysis["expenses"] = float(type_totals[0])
+
+    return calculate_daily_averages(analysis)
+
+
 def format_terminal_output(data, month, transactions_count=0):
     """Format terminal output for 80x24 characters as in screenshot"""
     output = []
@@ -422,8 +985,12 @@ def generate_daily_recommendations(data):
         return recs[:3]
 
 
-def prepare_summary_data(data, transactions):
-    """Prepare the data for the SUMMARY section - all categories and totals."""
+def prepare_summary_data(data, transactions=None):
+    """
+    Prepare the data for the SUMMARY section - all categories and totals.
+    Without transactions the per-category totals of the analysis are used,
+    which lets incrementally merged month state skip a full rescan.
+    """
     all_categories = [
         "TOTAL INCOME",
         "TOTAL EXPENSES",
@@ -451,16 +1018,17 @@ def prepare_summary_data(data, transactions):
         "Other",
     ]
 
-    # Collecting data by income
+    # Collecting data by income and expense in a single pass,
+    # so a streamed transactions iterator can be consumed too
     income_by_category = defaultdict(float)
-    for t in transactions:
+    expenses_by_category = defaultdict(float)
+    if transactions is None:
+        income_by_category.update(data["income_categories"])
+        expenses_by_category.update(data["categories"])
+    for t in transactions or ():
         if t["type"] == "income":
             income_by_category[t["category"]] += t["amount"]
-
-    # Collecting data by expense
-    expenses_by_category = defaultdict(float)
-    for t in transactions:
-        if t["type"] == "expense":
+        elif t["type"] == "expense":
             expenses_by_category[t["category"]] += t["amount"]
 
     # Preparing totals
@@ -534,26 +1102,68 @@ def prepare_summary_data(data, transactions):
     return table_data
 
 
+MONTH_SHEET_MERGES = ["A6:E6", "G6:I6", "K6:L6"]
+
+MONTH_SHEET_COLUMN_WIDTHS = [
+    ("A", 100),
+    ("B", 200),
+    ("C", 80),
+    ("D", 80),
+    ("E", 100),
+    ("G", 150),
+    ("H", 80),
+    ("I", 100),
+    ("K", 90),
+    ("L", 300),
+]
+
+
+def column_width_request(sheet_id, column_letter, width):
+    """Return the batchUpdate request setting one column width"""
+    # Convert column letter to index (A=1, B=2, etc.)
+    col_index = gspread.utils.a1_to_rowcol(column_letter + "1")[1]
+
+    return {
+        "updateDimensionProperties": {
+            "range": {
+                "sheetId": sheet_id,
+                "dimension": "COLUMNS",
+                "startIndex": col_index - 1,
+                "endIndex": col_index,
+            },
+            "properties": {"pixelSize": width},
+            "fields": "pixelSize",
+        }
+    }
+
+
+def format_request(sheet_id, range_name, cell_format):
+    """Return the batchUpdate request equivalent to worksheet.format()"""
+    return {
+        "repeatCell": {
+            "range": a1_range_to_grid_range(range_name, sheet_id),
+            "cell": {"userEnteredFormat": cell_format},
+            "fields": "userEnteredFormat(%s)" % ",".join(cell_format),
+        }
+    }
+
+
+def merge_request(sheet_id, range_name):
+    """Return the batchUpdate request equivalent to worksheet.merge_cells()"""
+    return {
+        "mergeCells": {
+            "mergeType": "MERGE_ALL",
+            "range": a1_range_to_grid_range(range_name, sheet_id),
+        }
+    }
+
+
 def set_column_width(worksheet, column_letter, width):
     """Set column width for worksheet"""
     try:
-        # Convert column letter to index (A=1, B=2, etc.)
-        col_index = gspread.utils.a1_to_rowcol(column_letter + "1")[1]
-
         body = {
             "requests": [
-                {
-                    "updateDimensionProperties": {
-                        "range": {
-                            "sheetId": worksheet.id,
-                            "dimension": "COLUMNS",
-                            "startIndex": col_index - 1,
-                            "endIndex": col_index,
-                        },
-                        "properties": {"pixelSize": width},
-                        "fields": "pixelSize",
-                    }
-                }
+                column_width_request(worksheet.id, column_letter, width)
             ]
         }
         worksheet.spreadsheet.batch_update(body)
@@ -561,144 +1171,501 @@ def set_column_width(worksheet, column_letter, width):
         print(f"⚠️ Error setting column width for {column_letter}: {e}")
 
 
+def transaction_table_formats(first_row, last_row):
+    """Return alternating column formats for transaction rows A:E"""
+    borders = {
+        "top": {"style": "SOLID", "width": 1},
+        "bottom": {"style": "SOLID", "width": 1},
+        "left": {"style": "SOLID", "width": 1},
+        "right": {"style": "SOLID", "width": 1},
+    }
+    grey = {"red": 0.95, "green": 0.95, "blue": 0.95}
+    white = {"red": 1.0, "green": 1.0, "blue": 1.0}
+
+    formats = []
+    for column, color in zip("ABCDE", [grey, white, grey, white, grey]):
+        column_format = {"backgroundColor": color, "borders": borders}
+        if column == "C":
+            column_format["numberFormat"] = {
+                "type": "CURRENCY",
+                "pattern": "€#,##0.00",
+            }
+        formats.append(
+            {
+                "range": f"{column}{first_row}:{column}{last_row}",
+                "format": column_format,
+            }
+        )
+    return formats
+
+
+def month_sheet_formats(last_transaction_row, last_category_row, last_rec_row):
+    """Return every cell format of a month sheet as batch_format entries"""
+    borders = {
+        "top": {"style": "SOLID", "width": 1},
+        "bottom": {"style": "SOLID", "width": 1},
+        "left": {"style": "SOLID", "width": 1},
+        "right": {"style": "SOLID", "width": 1},
+    }
+    grey = {"red": 0.95, "green": 0.95, "blue": 0.95}
+    white = {"red": 1.0, "green": 1.0, "blue": 1.0}
+    currency = {"type": "CURRENCY", "pattern": "€#,##0.00"}
+    percent = {"type": "PERCENT", "pattern": "0.00%"}
+    section_header = {
+        "textFormat": {"bold": True, "fontSize": 14},
+        "horizontalAlignment": "CENTER",
+    }
+    table_header = {
+        "textFormat": {"bold": True, "fontSize": 12},
+        "backgroundColor": {"red": 0.9, "green": 0.9, "blue": 0.9},
+        "borders": borders,
+    }
+
+    # Financial Overview header and table headers
+    formats = [
+        {"range": "A6", "format": section_header},
+        {"range": "A7:E7", "format": table_header},
+    ]
+
+    # Transaction table with alternating colors
+    if last_transaction_row > 7:
+        formats += transaction_table_formats(8, last_transaction_row)
+
+    # Transaction Categories header and table headers
+    formats += [
+        {"range": "G6", "format": section_header},
+        {"range": "G7:I7", "format": table_header},
+    ]
+
+    # Category table with alternating colors
+    if last_category_row > 7:
+        formats += [
+            {
+                "range": f"G8:G{last_category_row}",
+                "format": {"backgroundColor": grey, "borders": borders},
+            },
+            {
+                "range": f"H8:H{last_category_row}",
+                "format": {
+                    "backgroundColor": white,
+                    "borders": borders,
+                    "numberFormat": currency,
+                },
+            },
+            {
+                "range": f"I8:I{last_category_row}",
+                "format": {
+                    "backgroundColor": grey,
+                    "borders": borders,
+                    "numberFormat": percent,
+                },
+            },
+        ]
+
+    # Daily Recommendations header and table headers
+    formats += [
+        {"range": "K6", "format": section_header},
+        {"range": "K7:L7", "format": table_header},
+    ]
+
+    # Recommendations table with alternating colors
+    if last_rec_row > 7:
+        formats += [
+            {
+                "range": f"K8:K{last_rec_row}",
+                "format": {"backgroundColor": grey, "borders": borders},
+            },
+            {
+                "range": f"L8:L{last_rec_row}",
+                "format": {
+                    "backgroundColor": white,
+                    "borders": borders,
+                    "wrapStrategy": "WRAP",
+                },
+            },
+        ]
+
+    # Summary section formatting
+    formats += [
+        {
+            "range": "A2:A4",
+            "format": {
+                "textFormat": {"bold": True},
+                "backgroundColor": grey,
+                "borders": borders,
+            },
+        },
+        {
+            "range": "B2:B4",
+            "format": {
+                "textFormat": {"bold": False},
+                "backgroundColor": white,
+                "borders": borders,
+                "numberFormat": currency,
+            },
+        },
+        {
+            "range": "C2:C4",
+            "format": {
+                "textFormat": {"bold": False},
+                "backgroundColor": grey,
+                "borders": borders,
+                "numberFormat": percent,
+            },
+        },
+    ]
+    return formats
+
+
+def month_sheet_format_plan(
+    sheet_id, transaction_count, category_count, rec_count
+):
+    """
+    Build every merge, cell format and column width request of a month
+    sheet as one list, to be sent in a single spreadsheets.batchUpdate.
+    """
+    plan = [merge_request(sheet_id, name) for name in MONTH_SHEET_MERGES]
+
+    for entry in month_sheet_formats(
+        7 + transaction_count, 7 + category_count, 7 + rec_count
+    ):
+        plan.append(format_request(sheet_id, entry["range"], entry["format"]))
+
+    for column_letter, width in MONTH_SHEET_COLUMN_WIDTHS:
+        plan.append(column_width_request(sheet_id, column_letter, width))
+
+    return plan
+
+
+def transaction_sheet_rows(transactions):
+    """Return transaction rows in the month-sheet column order"""
+    if hasattr(transactions, "sheet_rows"):
+        return transactions.sheet_rows()
+
+    all_data = []
+    for t in transactions:
+        all_data.append(
+            [
+                t["date"],
+                t["desc"][:30],
+                t["amount"],
+                t["type"],
+                t["category"],
+            ]
+        )
+    return all_data
+
+
+def month_category_rows(data, transactions=None):
+    """Return the TRANSACTION CATEGORIES table rows of a month sheet"""
+    table_data = prepare_summary_data(data, transactions)
+    category_data = []
+    for row in table_data:
+        if row[0] and row[0] not in [
+            "",
+            "INCOME CATEGORIES:",
+            "EXPENSE CATEGORIES:",
+        ]:
+            category_data.append([row[0], row[1], row[2]])
+    return category_data
+
+
+def month_recommendation_rows(data):
+    """Return the DAILY RECOMMENDATIONS table rows of a month sheet"""
+    recommendations = generate_daily_recommendations(data)
+    rec_data = []
+    for i, rec in enumerate(recommendations, 1):
+        rec_data.append([f"{i}", rec[:100]])
+    return rec_data
+
+
+def month_summary_rows(data):
+    """Return the summary block written at the top of a month sheet"""
+    expense_percentage = (
+        data["expenses"] / data["income"] if data["income"] > 0 else 0
+    )
+    savings_percentage = (
+        data["savings"] / data["income"] if data["income"] > 0 else 0
+    )
+
+    return [
+        ["Total Income:", data["income"], 1.0],
+        ["Total Expenses:", data["expenses"], expense_percentage],
+        ["Savings:", data["savings"], savings_percentage],
+    ]
+
+
+def get_month_worksheet(month_name):
+    """
+    Open the month worksheet, creating it if needed.
+    Returns (worksheet, created), or (None, False) without credentials.
+    """
+    # 1. Authentication (pooled client)
+    if SHEETS_POOL.client() is None:
+        print("❌ No credentials for month sheet")
+        return None, False
+
+    sh = SHEETS_POOL.open("Personal Finances")
+
+    # 2. Get or create worksheet
+    try:
+        return SHEETS_POOL.worksheet(sh, month_name), False
+    except gspread.WorksheetNotFound:
+        print(f"📝 Creating new worksheet '{month_name}'...")
+        worksheet = sh.add_worksheet(
+            title=month_name,
+            rows="100",
+            cols="20"
+        )
+        SHEETS_POOL.remember_worksheet(sh, worksheet)
+        print(f"✅ Worksheet '{month_name}' created")
+        return worksheet, True
+
+
+def month_sheet_grid(transactions, data):
+    """
+    Build the desired A:L cell grid of a month sheet, plus the transaction,
+    category and recommendation counts the format plan needs.
+    """
+    all_data = transaction_sheet_rows(transactions)
+    category_data = month_category_rows(data, transactions)
+    rec_data = month_recommendation_rows(data)
+
+    height = 7 + max(len(all_data), len(category_data), len(rec_data))
+    grid = [[""] * 12 for _ in range(height)]
+
+    def place(row, col, values):
+        for r, values_row in enumerate(values):
+            for c, value in enumerate(values_row):
+                grid[row + r][col + c] = value
+
+    place(1, 0, month_summary_rows(data))
+    place(5, 0, [["FINANCIAL OVERVIEW"]])
+    place(6, 0, [["Date", "Description", "Amount", "Type", "Category"]])
+    place(7, 0, all_data)
+    place(5, 6, [["TRANSACTION CATEGORIES"]])
+    place(6, 6, [["Category", "Amount", "Percentage"]])
+    place(7, 6, category_data)
+    place(5, 10, [["DAILY RECOMMENDATIONS"]])
+    place(6, 10, [["Priority", "Recommendation"]])
+    place(7, 10, rec_data)
+
+    return grid, (len(all_data), len(category_data), len(rec_data))
+
+
+def month_grid_counts(grid):
+    """Count the filled transaction, category and recommendation rows"""
+    counts = []
+    for col in (0, 6, 10):
+        counts.append(
+            sum(
+                1
+                for row in grid[7:]
+                if col < len(row) and row[col] not in ("", None)
+            )
+        )
+    return tuple(counts)
+
+
+def same_cell_value(current, desired):
+    """Compare an unformatted sheet value with the value we would write"""
+    if desired in ("", None):
+        return current in ("", None)
+    if isinstance(desired, (int, float)) and isinstance(
+        current, (int, float)
+    ):
+        return float(current) == float(desired)
+    return current == desired
+
+
+def changed_ranges(current, desired):
+    """
+    Return values-update entries covering every cell where current differs
+    from desired. Runs of changed cells in a row become one range and equal
+    runs on consecutive rows are merged into one rectangle.
+    """
+    height = max(len(current), len(desired))
+    width = max([len(row) for row in current + desired] or [0])
+
+    def cell(grid, r, c):
+        if r < len(grid) and c < len(grid[r]):
+            return grid[r][c]
+        return ""
+
+    # (first_col, last_col) -> first row of the rectangle still open
+    open_runs = {}
+    rectangles = []
+    for r in range(height + 1):
+        runs = set()
+        c = 0
+        while r < height and c < width:
+            if same_cell_value(cell(current, r, c), cell(desired, r, c)):
+                c += 1
+                continue
+            start = c
+            while c < width and not same_cell_value(
+                cell(current, r, c), cell(desired, r, c)
+            ):
+                c += 1
+            runs.add((start, c - 1))
+
+        for run in list(open_runs):
+            if run not in runs:
+                rectangles.append((open_runs.pop(run), r - 1) + run)
+        for run in runs:
+            open_runs.setdefault(run, r)
+
+    updates = []
+    for first_row, last_row, first_col, last_col in sorted(rectangles):
+        values = [
+            [
+                cell(desired, r, c)
+                for c in range(first_col, last_col + 1)
+            ]
+            for r in range(first_row, last_row + 1)
+        ]
+        updates.append(
+            {
+                "range": (
+                    f"{rowcol_to_a1(first_row + 1, first_col + 1)}:"
+                    f"{rowcol_to_a1(last_row + 1, last_col + 1)}"
+                ),
+                "values": values,
+            }
+        )
+    return updates
+
+
+def sync_month_sheet(worksheet, transactions, data):
+    """
+    Bring an existing month worksheet up to date with one range read and
+    one values batch_update of the changed cells. The format plan is only
+    re-sent when the size of one of the tables changed.
+    """
+    desired, counts = month_sheet_grid(transactions, data)
+
+    max_retries = SHEETS_MAX_RETRIES
+    retry_count = 0
+
+    while retry_count < max_retries:
+        try:
+            current = worksheet.get_values(
+                "A1:L",
+                value_render_option=ValueRenderOption.unformatted,
+            )
+            updates = changed_ranges(current, desired)
+            if len(desired) > worksheet.row_count:
+                worksheet.add_rows(len(desired) - worksheet.row_count)
+            if updates:
+                worksheet.batch_update(updates)
+            break
+
+        except Exception as e:
+            retry_count += 1
+            if "429" in str(e) or "Quota exceeded" in str(e):
+                print(
+                    f"⚠️ Rate limit exceeded. "
+                    f"Retry {retry_count}/{max_retries} "
+                    f"once the Sheets quota allows..."
+                )
+            else:
+                print(f"❌ Error syncing data: {e}")
+                raise e
+
+    if retry_count >= max_retries:
+        print(f"❌ Failed to sync data after {max_retries} retries")
+        return False
+
+    print(f"🔁 {len(updates)} changed ranges written")
+
+    if month_grid_counts(current) != counts:
+        try:
+            plan = month_sheet_format_plan(worksheet.id, *counts)
+            worksheet.spreadsheet.batch_update({"requests": plan})
+        except Exception as format_error:
+            print(f"⚠️ Formatting error: {format_error}")
+
+    return True
+
+
 def write_to_month_sheet(month_name, transactions, data):
     """Write data to month worksheet in Google Sheets"""
     try:
         print(f"📊 Writing to {month_name} worksheet...")
 
-        # 1. Authentication
-        creds = get_google_credentials()
-        if not creds:
-            print("❌ No credentials for month sheet")
+        # 1-2. Authenticate and get or create worksheet
+        worksheet, created = get_month_worksheet(month_name)
+        if worksheet is None:
             return False
 
-        gc = gspread.authorize(creds)
-        sh = gc.open("Personal Finances")
-
-        # 2. Get or create worksheet
-        try:
-            worksheet = sh.worksheet(month_name)
-        except gspread.WorksheetNotFound:
-            print(f"📝 Creating new worksheet '{month_name}'...")
-            worksheet = sh.add_worksheet(
-                title=month_name,
-                rows="100",
-                cols="20"
-            )
-            print(f"✅ Worksheet '{month_name}' created")
-            time.sleep(3)
+        # Existing sheets only get the cells that changed
+        if MONTH_SHEET_SYNC == "diff" and not created:
+            return sync_month_sheet(worksheet, transactions, data)
 
         # 3. Clear existing data
         try:
             worksheet.clear()
-            time.sleep(3)
         except Exception as e:
             print(f"⚠️ Warning: Could not clear worksheet: {e}")
 
         # 4. Main data with retries
-        max_retries = 3
+        max_retries = SHEETS_MAX_RETRIES
         retry_count = 0
 
         while retry_count < max_retries:
             try:
                 # Financial Overview header
                 worksheet.update("A6", [["FINANCIAL OVERVIEW"]])
-                worksheet.merge_cells("A6:E6")
 
                 # Table headers
                 headers = ["Date", "Description", "Amount", "Type", "Category"]
                 worksheet.update("A7", [headers])
 
                 # Write transactions
-                all_data = []
-                for t in transactions:
-                    all_data.append(
-                        [
-                            t["date"],
-                            t["desc"][:30],
-                            t["amount"],
-                            t["type"],
-                            t["category"],
-                        ]
-                    )
+                all_data = transaction_sheet_rows(transactions)
 
                 if all_data:
                     worksheet.update("A8", all_data)
 
                 # Transaction Categories header
                 worksheet.update("G6", [["TRANSACTION CATEGORIES"]])
-                worksheet.merge_cells("G6:I6")
 
                 # Categories table headers
                 category_headers = ["Category", "Amount", "Percentage"]
                 worksheet.update("G7", [category_headers])
 
                 # Prepare and write category data
-                table_data = prepare_summary_data(data, transactions)
-                category_data = []
-                for row in table_data:
-                    if row[0] and row[0] not in [
-                        "",
-                        "INCOME CATEGORIES:",
-                        "EXPENSE CATEGORIES:",
-                    ]:
-                        category_data.append([row[0], row[1], row[2]])
+                category_data = month_category_rows(data, transactions)
 
                 if category_data:
                     worksheet.update("G8", category_data)
 
                 # Daily Recommendations header
                 worksheet.update("K6", [["DAILY RECOMMENDATIONS"]])
-                worksheet.merge_cells("K6:L6")
 
                 # Recommendations headers
                 rec_headers = ["Priority", "Recommendation"]
                 worksheet.update("K7", [rec_headers])
 
                 # Write recommendations
-                recommendations = generate_daily_recommendations(data)
-                rec_data = []
-                for i, rec in enumerate(recommendations, 1):
-                    rec_data.append([f"{i}", rec[:100]])
+                rec_data = month_recommendation_rows(data)
 
                 if rec_data:
                     worksheet.update("K8", rec_data)
 
                 # Summary section at the top
-                expense_percentage = (
-                    (
-                        data["expenses"] / data["income"]
-                        if data["income"] > 0
-                        else 0
-                    )
-                )
-                savings_percentage = (
-                    (
-                        data["savings"] / data["income"]
-                        if data["income"] > 0
-                        else 0
-                    )
-                )
-
-                summary_data = [
-                    ["Total Income:", data["income"], 1.0],
-                    ["Total Expenses:", data["expenses"], expense_percentage],
-                    ["Savings:", data["savings"], savings_percentage],
-                ]
-                worksheet.update("A2", summary_data)
+                worksheet.update("A2", month_summary_rows(data))
 
                 break
 
             except Exception as e:
                 retry_count += 1
                 if "429" in str(e) or "Quota exceeded" in str(e):
-                    wait_time = 60 * retry_count
                     print(
                         f"⚠️ Rate limit exceeded. "
                         f"Retry {retry_count}/{max_retries} "
-                        f"in {wait_time} seconds..."
+                        f"once the Sheets quota allows..."
                     )
-                    time.sleep(wait_time)
                 else:
                     print(f"❌ Error writing data: {e}")
                     raise e
@@ -707,643 +1674,2242 @@ def write_to_month_sheet(month_name, transactions, data):
             print(f"❌ Failed to write data after {max_retries} retries")
             return False
 
-        # 5. Formatting with colors
+        # 5. Merges, formatting with colors and column widths,
+        # all in a single batchUpdate
         try:
-            last_transaction_row = 7 + len(transactions)
-            last_category_row = 7 + len(category_data) if category_data else 7
-            last_rec_row = 7 + len(rec_data) if rec_data else 7
-
-            # Financial Overview header
-            worksheet.format(
-                "A6",
-                {
-                    "textFormat": {"bold": True, "fontSize": 14},
-                    "horizontalAlignment": "CENTER",
-                },
-            )
-
-            # Table headers
-            worksheet.format(
-                "A7:E7",
-                {
-                    "textFormat": {"bold": True, "fontSize": 12},
-                    "backgroundColor": {"red": 0.9, "green": 0.9, "blue": 0.9},
-                    "borders": {
-                        "top": {"style": "SOLID", "width": 1},
-                        "bottom": {"style": "SOLID", "width": 1},
-                        "left": {"style": "SOLID", "width": 1},
-                        "right": {"style": "SOLID", "width": 1},
-                    },
-                },
+            plan = month_sheet_format_plan(
+                worksheet.id,
+                len(transactions),
+                len(category_data),
+                len(rec_data),
             )
+            worksheet.spreadsheet.batch_update({"requests": plan})
+        except Exception as format_error:
+            print(f"⚠️ Formatting error: {format_error}")
 
-            # Transaction table with alternating colors
-            if last_transaction_row > 7:
-                worksheet.format(
-                    f"A8:A{last_transaction_row}",
-                    {
-                        "backgroundColor": {
-                            "red": 0.95,
-                            "green": 0.95,
-                            "blue": 0.95,
-                        },
-                        "borders": {
-                            "top": {"style": "SOLID", "width": 1},
-                            "bottom": {"style": "SOLID", "width": 1},
-                            "left": {"style": "SOLID", "width": 1},
-                            "right": {"style": "SOLID", "width": 1},
-                        },
-                    },
-                )
+        return True
 
-                worksheet.format(
-                    f"B8:B{last_transaction_row}",
-                    {
-                        "backgroundColor": {
-                            "red": 1.0,
-                            "green": 1.0,
-                            "blue": 1.0,
-                        },
-                        "borders": {
-                            "top": {"style": "SOLID", "width": 1},
-                            "bottom": {"style": "SOLID", "width": 1},
-                            "left": {"style": "SOLID", "width": 1},
-                            "right": {"style": "SOLID", "width": 1},
-                        },
-                    },
-                )
+    except Exception as e:
+        print(f"❌ Error writing to {month_name} worksheet: {e}")
+        SHEETS_POOL.forget_handles()
+        import traceback
 
-                worksheet.format(
-                    f"C8:C{last_transaction_row}",
-                    {
-                        "backgroundColor": {
-                            "red": 0.95,
-                            "green": 0.95,
-                            "blue": 0.95,
-                        },
-                        "borders": {
-                            "top": {"style": "SOLID", "width": 1},
-                            "bottom": {"style": "SOLID", "width": 1},
-                            "left": {"style": "SOLID", "width": 1},
-                            "right": {"style": "SOLID", "width": 1},
-                        },
-                        "numberFormat": {
-                            "type": "CURRENCY",
-                            "pattern": "€#,##0.00",
-                        },
-                    },
-                )
+        print(f"🔍 Traceback: {traceback.format_exc()}")
+        return False
 
-                worksheet.format(
-                    f"D8:D{last_transaction_row}",
-                    {
-                        "backgroundColor": {
-                            "red": 1.0,
-                            "green": 1.0,
-                            "blue": 1.0,
-                        },
-                        "borders": {
-                            "top": {"style": "SOLID", "width": 1},
-                            "bottom": {"style": "SOLID", "width": 1},
-                            "left": {"style": "SOLID", "width": 1},
-                            "right": {"style": "SOLID", "width": 1},
-                        },
-                    },
-                )
 
-                worksheet.format(
-                    f"E8:E{last_transaction_row}",
-                    {
-                        "backgroundColor": {
-                            "red": 0.95,
-                            "green": 0.95,
-                            "blue": 0.95,
-                        },
-                        "borders": {
-                            "top": {"style": "SOLID", "width": 1},
-                            "bottom": {"style": "SOLID", "width": 1},
-                            "left": {"style": "SOLID", "width": 1},
-                            "right": {"style": "SOLID", "width": 1},
-                        },
-                    },
-                )
+def append_to_month_sheet(month_name, transactions, previous_count, data):
+    """
+    Append new transaction rows to an already written month worksheet.
+    Only the rows after previous_count are written, together with the
+    category table, recommendations and summary block; nothing is cleared.
+    """
+    try:
+        new_count = len(transactions) - previous_count
+        print(f"📊 Appending {new_count} rows to {month_name} worksheet...")
 
-            # Transaction Categories header
-            worksheet.format(
-                "G6",
-                {
-                    "textFormat": {"bold": True, "fontSize": 14},
-                    "horizontalAlignment": "CENTER",
-                },
+        worksheet, created = get_month_worksheet(month_name)
+        if worksheet is None:
+            return False
+        if created or previous_count == 0:
+            return write_to_month_sheet(month_name, transactions, data)
+
+        first_row = 8 + previous_count
+        last_row = 7 + len(transactions)
+        if last_row > worksheet.row_count:
+            worksheet.add_rows(last_row - worksheet.row_count)
+
+        if hasattr(transactions, "sheet_rows"):
+            delta_rows = transactions.sheet_rows(previous_count)
+        else:
+            delta_rows = transaction_sheet_rows(transactions[previous_count:])
+
+        # Always three rows, so fewer recommendations blank out old ones
+        rec_data = month_recommendation_rows(data)
+        rec_data += [["", ""]] * (3 - len(rec_data))
+
+        updates = [
+            {"range": "A2", "values": month_summary_rows(data)},
+            {"range": "G8", "values": month_category_rows(data)},
+            {"range": "K8", "values": rec_data},
+        ]
+        if delta_rows:
+            updates.append({"range": f"A{first_row}", "values": delta_rows})
+
+        max_retries = SHEETS_MAX_RETRIES
+        retry_count = 0
+
+        while retry_count < max_retries:
+            try:
+                # gspread rewrites each range in place, so every attempt
+                # gets fresh copies
+                worksheet.batch_update([dict(update) for update in updates])
+                if delta_rows:
+                    worksheet.batch_format(
+                        transaction_table_formats(first_row, last_row)
+                    )
+                break
+
+            except Exception as e:
+                retry_count += 1
+                if "429" in str(e) or "Quota exceeded" in str(e):
+                    print(
+                        f"⚠️ Rate limit exceeded. "
+                        f"Retry {retry_count}/{max_retries} "
+                        f"once the Sheets quota allows..."
+                    )
+                else:
+                    print(f"❌ Error appending data: {e}")
+                    raise e
+
+        if retry_count >= max_retries:
+            print(f"❌ Failed to append data after {max_retries} retries")
+            return False
+
+        return True
+
+    except Exception as e:
+        print(f"❌ Error appending to {month_name} worksheet: {e}")
+        SHEETS_POOL.forget_handles()
+        import traceback
+
+        print(f"🔍 Traceback: {traceback.format_exc()}")
+        return False
+
+
+class SummaryLayout:
+    """
+    Layout of the SUMMARY header row (row 2): header -> column map and the
+    next free column, so consecutive months share a single header read.
+    """
+
+    def __init__(self, headers):
+        self.headers = list(headers)
+        self.loaded_at = time.monotonic()
+        self.columns = {}
+        for i, header in enumerate(self.headers, 1):
+            if header.strip():
+                self.columns.setdefault(header, i)
+
+    def column_of(self, header):
+        return self.columns.get(header)
+
+    def next_free_column(self):
+        """First empty header cell, or the column after the last header"""
+        for i, header in enumerate(self.headers, 1):
+            if not header.strip():
+                return i
+        return len(self.headers) + 1
+
+    def assign(self, column, header):
+        """Record a header written to the sheet at column"""
+        while len(self.headers) < column:
+            self.headers.append("")
+        self.headers[column - 1] = header
+        self.columns.setdefault(header, column)
+
+
+def get_summary_layout(summary_sheet):
+    """Return the cached SUMMARY layout, reading row 2 when missing or old"""
+    with SUMMARY_LAYOUT_LOCK:
+        layout = SUMMARY_LAYOUTS.get(summary_sheet.id)
+        if (
+            layout is None
+            or time.monotonic() - layout.loaded_at > SUMMARY_LAYOUT_TTL
+        ):
+            layout = SummaryLayout(summary_sheet.row_values(2))
+            SUMMARY_LAYOUTS[summary_sheet.id] = layout
+        return layout
+
+
+@contextmanager
+def summary_layout_lock():
+    """
+    Host-wide lock around SUMMARY header changes: an exclusive SQLite
+    transaction on SUMMARY_LOCK_PATH, released on exit or when the
+    holding process dies.
+    """
+    directory = os.path.dirname(SUMMARY_LOCK_PATH)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    connection = sqlite3.connect(
+        SUMMARY_LOCK_PATH, timeout=120, isolation_level=None
+    )
+    try:
+        connection.execute("BEGIN EXCLUSIVE")
+        yield
+    finally:
+        connection.close()
+
+
+def invalidate_summary_layout(summary_sheet=None):
+    """Forget the cached SUMMARY layout of one sheet, or of all sheets"""
+    with SUMMARY_LAYOUT_LOCK:
+        if summary_sheet is None:
+            SUMMARY_LAYOUTS.clear()
+        else:
+            SUMMARY_LAYOUTS.pop(summary_sheet.id, None)
+
+
+def write_summary_column(summary_sheet, layout, normalized_month, table_data):
+    """
+    Write a month's amount and percentage columns to SUMMARY in one values
+    batch update, adding the month headers in a free column if needed.
+    """
+    # 5. Find the month column
+    month_col = layout.column_of(normalized_month)
+
+    new_column = month_col is None
+    if month_col is None:
+        print("🔍 No existing column found, looking for empty column...")
+        # Find first empty column
+        month_col = layout.next_free_column()
+        if month_col <= len(layout.headers):
+            print(f"✅ Found empty column at position: {month_col}")
+            print(f"📝 Creating new column for {normalized_month}...")
+        else:
+            print("🔍 No empty columns, adding at the end...")
+            # Add new columns at the end
+            if month_col > 37:
+                print("❌ Column limit reached (37)")
+                return False
+
+            print(f"📝 Adding new column at position: {month_col}")
+
+    header_updates = []
+    if new_column:
+        # Header cells go out in the same request as the values
+        header_updates = [
+            {
+                "range": rowcol_to_a1(2, month_col),
+                "values": [[normalized_month]],
+            },
+            {
+                "range": rowcol_to_a1(3, month_col + 1),
+                "values": [[f"{normalized_month} %"]],
+            },
+        ]
+
+    # 6. Prepare the amount and percentage columns as one range;
+    # None leaves a cell untouched, like skipping a malformed row
+    column_values = []
+    for row_data in table_data:
+        if len(row_data) == 3:
+            category, amount, percentage = row_data
+            column_values.append([amount, percentage])
+        else:
+            column_values.append([None, None])
+
+    update_data = list(header_updates)
+    if column_values:
+        first_cell = rowcol_to_a1(4, month_col)
+        last_cell = rowcol_to_a1(3 + len(column_values), month_col + 1)
+        update_data.append(
+            {
+                "range": f"{first_cell}:{last_cell}",
+                "values": column_values,
+            }
+        )
+
+    # 7. Single values batch update
+    if update_data:
+        max_retries = SHEETS_MAX_RETRIES
+        retry_count = 0
+        success = False
+
+        while not success and retry_count < max_retries:
+            try:
+                # gspread rewrites each range in place, so every
+                # attempt gets fresh copies
+                summary_sheet.batch_update(
+                    [dict(update) for update in update_data]
+                )
+                success = True
+
+            except Exception as e:
+                if "429" in str(e) or "Quota exceeded" in str(e):
+                    retry_count += 1
+                    print(
+                        f"⚠️ Rate limit exceeded. "
+                        f"Retry {retry_count}/{max_retries} "
+                        f"once the Sheets quota allows..."
+                    )
+                else:
+                    # The cached layout may be stale, re-read it next time
+                    print(f"❌ Error in batch update: {e}")
+                    invalidate_summary_layout(summary_sheet)
+                    raise e
+
+        if not success:
+            print(
+                f"❌ Failed to write SUMMARY column "
+                f"after {max_retries} retries"
             )
+            return False
 
-            # Categories table headers
-            worksheet.format(
-                "G7:I7",
-                {
-                    "textFormat": {"bold": True, "fontSize": 12},
-                    "backgroundColor": {"red": 0.9, "green": 0.9, "blue": 0.9},
-                    "borders": {
-                        "top": {"style": "SOLID", "width": 1},
-                        "bottom": {"style": "SOLID", "width": 1},
-                        "left": {"style": "SOLID", "width": 1},
-                        "right": {"style": "SOLID", "width": 1},
-                    },
-                },
+        if new_column:
+            layout.assign(month_col, normalized_month)
+            print(
+                f"✅ Created new column for {normalized_month} "
+                f"at position: {month_col}"
+            )
+
+    return True
+
+
+def sync_google_sheets_operation(month_name, table_data):
+    """Synchronous Google Sheets operation"""
+    try:
+
+        # 1. Authentication (pooled client)
+        if SHEETS_POOL.client() is None:
+            print("❌ No credentials available")
+            return False
+
+        # 2. Open target spreadsheet by ID
+        try:
+            spreadsheet_key = "1US65_F99qrkqbl2oVkMa4DGUiLacEDRoNz_J9hr2bbQ"
+            target_spreadsheet = SHEETS_POOL.open_by_key(spreadsheet_key)
+        except Exception as e:
+            print(f"❌ Error opening spreadsheet: {e}")
+            return False
+
+        try:
+            summary_sheet = SHEETS_POOL.worksheet(
+                target_spreadsheet, "SUMMARY"
+            )
+        except Exception as e:
+            print(f"❌ Error accessing SUMMARY worksheet: {e}")
+            return False
+
+        # 3. Get current headers (cached layout)
+        layout = get_summary_layout(summary_sheet)
+
+        # 4. Normalizing month name for comparison
+        normalized_month = month_name.capitalize()
+
+        if layout.column_of(normalized_month) is not None:
+            return write_summary_column(
+                summary_sheet, layout, normalized_month, table_data
+            )
+
+        # A new column changes the header row: hold the host-wide lock and
+        # start from a fresh read, so a worker with a stale cache cannot
+        # give the same free column to another month
+        with summary_layout_lock():
+            cached_headers = layout.headers
+            invalidate_summary_layout(summary_sheet)
+            layout = get_summary_layout(summary_sheet)
+            if layout.headers != cached_headers:
+                print("🔄 SUMMARY headers changed elsewhere, layout reloaded")
+            return write_summary_column(
+                summary_sheet, layout, normalized_month, table_data
+            )
+
+    except Exception as e:
+        print(f"❌ Error in sync_google_sheets_operation: {e}")
+        SHEETS_POOL.forget_handles()
+        import traceback
+
+        print(f"🔍 Traceback: {traceback.format_exc()}")
+        return False
+
+
+def write_to_target_sheet(table_data, month_name):
+    """Write data to target SUMMARY sheet"""
+    try:
+        if not table_data:
+            print("✗ No data to write to target sheet")
+            return False
+
+        if len(table_data) > 50:
+            print(
+                f"⚠️ Large dataset({
+                    len(table_data)} rows), simplifying update"
+            )
+            simplified_data = []
+            for row in table_data:
+                if row[0] in ["TOTAL INCOME", "TOTAL EXPENSES", "SAVINGS"]:
+                    simplified_data.append(row)
+                elif (
+                    row[0] and
+                    not any(x in row[0] for x in ["CATEGORIES", ""])
+                ):
+                    simplified_data.append([row[0], row[1], 0])
+            table_data = simplified_data
+
+        return sync_google_sheets_operation(month_name, table_data)
+
+    except Exception as e:
+        print(f"✗ Error in writing into SUMMARY: {e}")
+        return False
+
+
+class OutputSink(ABC):
+    """
+    Destination of month layouts and SUMMARY columns.
+    write_reports() takes every month at once, so sinks can write a whole
+    batch in a single pass; the per-month methods wrap it.
+    """
+
+    def write_month(self, month_name, transactions, data, previous_count=0):
+        """Write one month layout; previous_count rows are already there"""
+        return self.write_reports([(month_name, transactions, data)], [])
+
+    def write_summary(self, table_data, month_name):
+        """Write one month's SUMMARY columns"""
+        return self.write_reports([], [(month_name, table_data)])
+
+    @abstractmethod
+    def write_reports(self, months, summaries):
+        """
+        Write (month_name, transactions, data) month layouts and
+        (month_name, table_data) SUMMARY columns; returns success.
+        """
+
+
+class GoogleSheetsSink(OutputSink):
+    """Month worksheets and the SUMMARY sheet in Google Sheets"""
+
+    def write_month(self, month_name, transactions, data, previous_count=0):
+        if previous_count:
+            return append_to_month_sheet(
+                month_name, transactions, previous_count, data
+            )
+        return write_to_month_sheet(month_name, transactions, data)
+
+    def write_summary(self, table_data, month_name):
+        return write_to_target_sheet(table_data, month_name)
+
+    def write_reports(self, months, summaries):
+        success = True
+        for month_name, transactions, data in months:
+            if not self.write_month(month_name, transactions, data):
+                success = False
+        for month_name, table_data in summaries:
+            if not self.write_summary(table_data, month_name):
+                success = False
+        return success
+
+
+class CsvSink(OutputSink):
+    """
+    Local CSV files: <month>.csv in the month worksheet layout and
+    SUMMARY.csv with an amount and a percentage column per month.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def replace_file(self, name, rows):
+        """Atomically write rows to a CSV file in the sink directory"""
+        os.makedirs(self.directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as file:
+            csv.writer(file).writerows(rows)
+        os.replace(temp_path, os.path.join(self.directory, name))
+
+    def read_summary(self):
+        """Return the SUMMARY.csv rows, or an empty list"""
+        path = os.path.join(self.directory, "SUMMARY.csv")
+        if not os.path.exists(path):
+            return []
+        with open(path, "r", encoding="utf-8", newline="") as file:
+            return list(csv.reader(file))
+
+    def write_summary_file(self, summaries):
+        """Merge (month_name, table_data) columns into SUMMARY.csv"""
+        rows = self.read_summary()
+        header = rows[0] if rows else ["Category"]
+        columns = {}
+        for month_name, table_data in summaries:
+            columns[month_name.capitalize()] = table_data
+
+        # Existing months keep their place, new ones go at the end
+        for month_name in columns:
+            if month_name not in header:
+                header += [month_name, f"{month_name} %"]
+
+        labels = [row[0] for row in next(iter(columns.values()))]
+        body = [[label] + [""] * (len(header) - 1) for label in labels]
+        for r, row in enumerate(rows[1:len(labels) + 1]):
+            body[r][1:len(row)] = row[1:]
+        for month_name, table_data in columns.items():
+            col = header.index(month_name)
+            for r, row in enumerate(table_data):
+                body[r][col:col + 2] = row[1:3]
+
+        self.replace_file("SUMMARY.csv", [header] + body)
+
+    def write_reports(self, months, summaries):
+        try:
+            for month_name, transactions, data in months:
+                grid, _ = month_sheet_grid(transactions, data)
+                self.replace_file(f"{secure_filename(month_name)}.csv", grid)
+
+            if summaries:
+                # Other processes update SUMMARY.csv too; without the lock
+                # a column written meanwhile would be lost
+                with summary_layout_lock():
+                    self.write_summary_file(summaries)
+            return True
+
+        except (OSError, sqlite3.Error) as e:
+            print(f"❌ Error writing CSV reports: {e}")
+            return False
+
+
+class SqliteSink(OutputSink):
+    """
+    Local SQLite database with the non-empty cells of each month layout
+    and one SUMMARY row per month and category.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def connect(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS month_cells ("
+            "month TEXT NOT NULL, row INTEGER NOT NULL, "
+            "col INTEGER NOT NULL, value, "
+            "PRIMARY KEY (month, row, col)) WITHOUT ROWID"
+        )
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS summary ("
+            "month TEXT NOT NULL, row INTEGER NOT NULL, "
+            "category TEXT NOT NULL, amount, percentage, "
+            "PRIMARY KEY (month, row)) WITHOUT ROWID"
+        )
+        return connection
+
+    def write_reports(self, months, summaries):
+        try:
+            with closing(self.connect()) as connection, connection:
+                for month_name, transactions, data in months:
+                    grid, _ = month_sheet_grid(transactions, data)
+                    connection.execute(
+                        "DELETE FROM month_cells WHERE month = ?",
+                        (month_name,),
+                    )
+                    connection.executemany(
+                        "INSERT INTO month_cells VALUES (?, ?, ?, ?)",
+                        (
+                            (month_name, r + 1, c + 1, value)
+                            for r, row in enumerate(grid)
+                            for c, value in enumerate(row)
+                            if value != ""
+                        ),
+                    )
+
+                for month_name, table_data in summaries:
+                    month_name = month_name.capitalize()
+                    connection.execute(
+                        "DELETE FROM summary WHERE month = ?", (month_name,)
+                    )
+                    connection.executemany(
+                        "INSERT INTO summary VALUES (?, ?, ?, ?, ?)",
+                        (
+                            (month_name, r + 1, *row[:3])
+                            for r, row in enumerate(table_data)
+                        ),
+                    )
+            return True
+
+        except sqlite3.Error as e:
+            print(f"❌ Error writing SQLite reports: {e}")
+            return False
+
+
+def get_output_sink(name=None):
+    """Return the output sink called name, OUTPUT_SINK by default"""
+    name = name or OUTPUT_SINK
+    if name == "sheets":
+        return GoogleSheetsSink()
+    if name == "csv":
+        return CsvSink(OUTPUT_DIR)
+    if name == "sqlite":
+        return SqliteSink(os.path.join(OUTPUT_DIR, "reports.sqlite3"))
+    raise ValueError(f"Unknown output sink: {name}")
+
+
+def export_reports(file_paths, sink_name=None):
+    """
+    Analyse hsbc_<month>.csv statements and write all their month layouts
+    and SUMMARY columns through one output sink in a single pass.
+    """
+    sink = get_output_sink(sink_name)
+    months = []
+    summaries = []
+    for file_path in file_paths:
+        name = os.path.splitext(os.path.basename(file_path))[0]
+        month = name[len("hsbc_"):] if name.startswith("hsbc_") else name
+
+        transactions, daily_categories = load_transaction_store_cached(
+            file_path
+        )
+        if not transactions:
+            print(f"No transactions found in {file_path}")
+            continue
+
+        data = analyze(transactions, daily_categories, month)
+        months.append((month, transactions, data))
+        summaries.append(
+            (
+                get_month_column_name(month),
+                prepare_summary_data(data, transactions),
             )
+        )
+
+    success = sink.write_reports(months, summaries)
+    print(f"{'✅' if success else '❌'} Exported {len(months)} months")
+    return success
 
-            # Category table with alternating colors
-            if last_category_row > 7:
-                worksheet.format(
-                    f"G8:G{last_category_row}",
-                    {
-                        "backgroundColor": {
-                            "red": 0.95,
-                            "green": 0.95,
-                            "blue": 0.95,
-                        },
-                        "borders": {
-                            "top": {"style": "SOLID", "width": 1},
-                            "bottom": {"style": "SOLID", "width": 1},
-                            "left": {"style": "SOLID", "width": 1},
-                            "right": {"style": "SOLID", "width": 1},
-                        },
-                    },
+
+# Records end in "\r\n", "\n" or a lone "\r", like universal newlines
+LINE_BREAK = re.compile(r"\r\n|\r|\n")
+RAW_LINE_BREAK = re.compile(rb"\r\n|\r|\n")
+
+
+def iter_decoded_lines(file_path_or_object, chunk_size=8192):
+    """Yield decoded text lines from a file object or path, chunk by chunk"""
+    # Handle both file objects and file paths
+    if hasattr(file_path_or_object, "read"):
+        # File object - rewind to beginning for mobile devices
+        file_path_or_object.seek(0)
+        source = file_path_or_object
+        owns_source = False
+    else:
+        source = open(file_path_or_object, "rb")
+        owns_source = True
+
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    remainder = ""
+
+    try:
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                break
+
+            if isinstance(chunk, bytes):
+                try:
+                    text = decoder.decode(chunk)
+                except UnicodeDecodeError:
+                    # Try other encodings if UTF-8 fails
+                    pending = decoder.getstate()[0]
+                    decoder = codecs.getincrementaldecoder("latin-1")()
+                    text = decoder.decode(pending + chunk)
+            else:
+                text = chunk
+
+            text = remainder + text
+            # A "\r" at the end may be the first half of a "\r\n"
+            held = "\r" if text.endswith("\r") else ""
+            lines = LINE_BREAK.split(text[:len(text) - len(held)])
+            remainder = lines.pop() + held
+            for line in lines:
+                yield line
+
+        remainder += decoder.decode(b"", final=True)
+        if remainder:
+            yield from LINE_BREAK.split(remainder)
+    finally:
+        if owns_source:
+            source.close()
+
+
+MONTH_ABBREVIATIONS = {
+    "jan": 1,
+    "feb": 2,
+    "mar": 3,
+    "apr": 4,
+    "may": 5,
+    "jun": 6,
+    "jul": 7,
+    "aug": 8,
+    "sep": 9,
+    "oct": 10,
+    "nov": 11,
+    "dec": 12,
+}
+
+
+class DateNormalizer:
+    """
+    Convert statement dates such as "31 Mar 2025" to "2025-03-31".
+    A hand-written fast path handles the HSBC "%d %b %Y" format, results
+    are memoized per distinct date string, and anything unusual falls back
+    to datetime.strptime. Invalid dates normalize to None. The memo and
+    its hit counters are shared by request threads, so they are locked.
+    """
+
+    def __init__(self, date_format="%d %b %Y", maxsize=10000):
+        self.date_format = date_format
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._memo = {}
+        self._lock = threading.Lock()
+
+    def normalize(self, date_str):
+        with self._lock:
+            if date_str in self._memo:
+                self.hits += 1
+                return self._memo[date_str]
+            self.misses += 1
+
+        result = self.parse(date_str)
+        with self._lock:
+            # Statements only have a few hundred distinct dates; start
+            # over rather than grow without bound on garbage input
+            if len(self._memo) >= self.maxsize:
+                self._memo.clear()
+            self._memo[date_str] = result
+        return result
+
+    def parse(self, date_str):
+        """Parse a date string without the memo"""
+        parts = date_str.split(" ")
+        if len(parts) == 3:
+            day, month, year = parts
+            month_number = MONTH_ABBREVIATIONS.get(month.lower())
+            if (
+                month_number
+                and 1 <= len(day) <= 2
+                and day.isdigit()
+                and len(year) == 4
+                and year.isdigit()
+            ):
+                try:
+                    return date(int(year), month_number, int(day)).isoformat()
+                except ValueError:
+                    return None
+
+        # Try other date formats if needed
+        try:
+            date_obj = datetime.strptime(date_str, self.date_format)
+        except ValueError:
+            return None
+        return date_obj.strftime("%Y-%m-%d")
+
+    def clear(self):
+        with self._lock:
+            self._memo.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._memo),
+                "maxsize": self.maxsize,
+            }
+
+
+DATE_NORMALIZER = DateNormalizer()
+
+
+def benchmark_date_normalization(rows=200000, distinct_dates=365):
+    """Print the per-row cost of strptime, the fast path and the memo"""
+    start = date(2024, 1, 1).toordinal()
+    samples = [
+        date.fromordinal(start + i % distinct_dates).strftime("%d %b %Y")
+        for i in range(rows)
+    ]
+
+    def strptime_path(date_str):
+        return datetime.strptime(date_str, "%d %b %Y").strftime("%Y-%m-%d")
+
+    normalizer = DateNormalizer()
+    candidates = [
+        ("strptime + strftime", strptime_path),
+        ("fast path", normalizer.parse),
+        ("fast path + memo", normalizer.normalize),
+    ]
+
+    print(f"📅 Date normalization: {rows} rows, {distinct_dates} dates")
+    for name, parse in candidates:
+        started = time.perf_counter()
+        for date_str in samples:
+            parse(date_str)
+        elapsed = time.perf_counter() - started
+        print(f"{name:<20} {elapsed / rows * 1e6:8.3f} µs/row")
+
+
+def line_fields(line):
+    """Split a decoded CSV line into stripped fields, or None if skipped"""
+    line = line.strip()
+    if not line or line.startswith(("#", "Date", "Date,")):
+        return None
+
+    # More robust CSV parsing
+    return [part.strip() for part in line.split(",")]
+
+
+def parse_transaction_fields(parts):
+    """Build a transaction dict from CSV fields, or None if it is skipped"""
+    if parts is None or len(parts) < 5:
+        return None
+
+    # Parse date (assuming format: "31 Mar 2025")
+    date_str = parts[0]
+    description = parts[1]
+
+    try:
+        amount = float(parts[2])
+    except ValueError:
+        return None
+
+    currency = parts[3]
+    transaction_type = parts[4].lower()
+
+    # Convert date to standard format
+    date_formatted = DATE_NORMALIZER.normalize(date_str)
+    if date_formatted is None:
+        return None
+
+    # Categorize
+    category = categorize(description)
+
+    return {
+        "date": date_formatted,
+        "desc": description[:30],
+        "amount": amount,
+        "type": "income" if transaction_type == "credit" else "expense",
+        "category": category,
+    }
+
+
+def parse_transaction_line(line):
+    """Parse one CSV line into a transaction dict, or None if it is skipped"""
+    return parse_transaction_fields(line_fields(line))
+
+
+def raw_line_fields(raw, encoding):
+    """
+    Decode the five parsed fields of one raw CSV line, or None if the line
+    is skipped. Lines that are not valid in the sniffed encoding fall back
+    to latin-1 on their own.
+    """
+    raw = raw.strip()
+    if not raw or raw.startswith((b"#", b"Date")):
+        return None
+
+    fields = raw.split(b",", 5)[:5]
+    try:
+        return [f.decode(encoding).strip() for f in fields]
+    except UnicodeDecodeError:
+        # Non-UTF-8 bytes past the sniffed prefix
+        return [f.decode("latin-1").strip() for f in fields]
+
+
+def sniff_encoding(prefix):
+    """Pick the file encoding once from a sniffed prefix of raw bytes"""
+    try:
+        # Not final, so a character cut off at the end of the prefix is ok
+        codecs.getincrementaldecoder("utf-8")().decode(prefix)
+        return "utf-8"
+    except UnicodeDecodeError:
+        return "latin-1"
+
+
+def iter_mapped_fields(
+    file_path, sniff_bytes=ENCODING_SNIFF_BYTES, block_size=1024 * 1024
+):
+    """
+    Yield the CSV fields of each line of a file through a memory map.
+    Newlines are found in the raw bytes and only the five fields the
+    parser uses are decoded; skipped lines yield None.
+    """
+    with open(file_path, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+        if size == 0:
+            return
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            encoding = sniff_encoding(mapped[:sniff_bytes])
+            start = 0
+            while start < size:
+                # Slice whole lines a block at a time so only one block of
+                # the mapping is ever copied into memory
+                end = max(
+                    mapped.rfind(b"\n", start, start + block_size),
+                    mapped.rfind(b"\r", start, start + block_size),
                 )
+                if end == -1:
+                    found = RAW_LINE_BREAK.search(mapped, start + block_size)
+                    end = found.start() if found else -1
+                if end == -1 or start + block_size >= size:
+                    end = size
+
+                for raw in RAW_LINE_BREAK.split(mapped[start:end]):
+                    yield raw_line_fields(raw, encoding)
+                start = end + (2 if mapped[end:end + 2] == b"\r\n" else 1)
+
+
+def iter_transaction_fields(file_path_or_object):
+    """Yield CSV fields per line from a file path or a file object"""
+    if hasattr(file_path_or_object, "read"):
+        for line in iter_decoded_lines(file_path_or_object):
+            yield line_fields(line)
+    else:
+        yield from iter_mapped_fields(file_path_or_object)
+
 
-                worksheet.format(
-                    f"H8:H{last_category_row}",
-                    {
-                        "backgroundColor": {
-                            "red": 1.0,
-                            "green": 1.0,
-                            "blue": 1.0,
-                        },
-                        "borders": {
-                            "top": {"style": "SOLID", "width": 1},
-                            "bottom": {"style": "SOLID", "width": 1},
-                            "left": {"style": "SOLID", "width": 1},
-                            "right": {"style": "SOLID", "width": 1},
-                        },
-                        "numberFormat": {
-                            "type": "CURRENCY",
-                            "pattern": "€#,##0.00",
-                        },
-                    },
+def iter_transactions(file_path_or_object, daily_categories=None):
+    """
+    Stream transactions from an uploaded file one record at a time.
+    Daily expense totals are accumulated into daily_categories as
+    records are yielded, so memory stays flat regardless of file size.
+    """
+    count = 0
+    for line_num, fields in enumerate(
+        iter_transaction_fields(file_path_or_object), 1
+    ):
+        try:
+            transaction = parse_transaction_fields(fields)
+        except (ValueError, IndexError) as e:
+            print(f"⚠️ Warning: Error parsing line {line_num}: {e}")
+            continue
+
+        if transaction is None:
+            continue
+
+        # Track daily categories for expenses
+        if daily_categories is not None and transaction["type"] == "expense":
+            daily = daily_categories[transaction["date"]]
+            daily[transaction["category"]] += transaction["amount"]
+
+        count += 1
+        yield transaction
+
+    print(f"✅ Loaded {count} transactions")
+
+
+def split_file_ranges(file_path, parts):
+    """Split a file into byte ranges that start and end on line breaks"""
+    size = os.path.getsize(file_path)
+    parts = max(1, min(parts, size // PARALLEL_MIN_RANGE_BYTES or 1))
+    boundaries = [0]
+    if parts > 1:
+        with open(file_path, "rb") as file, mmap.mmap(
+            file.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mapped:
+            for i in range(1, parts):
+                found = RAW_LINE_BREAK.search(
+                    mapped, max(size * i // parts, boundaries[-1])
                 )
+                if found is None or found.end() >= size:
+                    break
+                if found.end() > boundaries[-1]:
+                    boundaries.append(found.end())
+    boundaries.append(size)
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def parse_file_range(file_path, start, end, encoding="utf-8"):
+    """
+    Parse and categorize one byte range of a CSV file in a worker process.
+    Lines are decoded like iter_mapped_fields() does: in the encoding
+    sniffed for the whole file, with a per-line latin-1 fallback.
+    """
+    with open(file_path, "rb") as file:
+        file.seek(start)
+        raw = file.read(end - start)
 
-                worksheet.format(
-                    f"I8:I{last_category_row}",
-                    {
-                        "backgroundColor": {
-                            "red": 0.95,
-                            "green": 0.95,
-                            "blue": 0.95,
-                        },
-                        "borders": {
-                            "top": {"style": "SOLID", "width": 1},
-                            "bottom": {"style": "SOLID", "width": 1},
-                            "left": {"style": "SOLID", "width": 1},
-                            "right": {"style": "SOLID", "width": 1},
-                        },
-                        "numberFormat": {
-                            "type": "PERCENT",
-                            "pattern": "0.00%",
-                        },
-                    },
+    transactions = []
+    for line in RAW_LINE_BREAK.split(raw):
+        try:
+            transaction = parse_transaction_fields(
+                raw_line_fields(line, encoding)
+            )
+        except (ValueError, IndexError):
+            continue
+        if transaction is None:
+            continue
+        transactions.append(transaction)
+    return transactions
+
+
+def load_transactions_parallel(file_path, workers=None):
+    """
+    Parse a large CSV file on several cores.
+    The file is split into newline-aligned byte ranges that are parsed in
+    a process pool; partial results are merged back in original order.
+    Daily totals are summed row by row after the merge, so they are
+    bitwise-equal to the ones load_transactions() produces.
+    """
+    workers = workers or os.cpu_count() or 1
+    ranges = split_file_ranges(file_path, workers)
+    if len(ranges) == 1:
+        return load_transactions(file_path)
+
+    transactions = []
+    daily_categories = defaultdict(lambda: defaultdict(float))
+
+    try:
+        # Sniff once for the whole file, as the sequential loader does
+        with open(file_path, "rb") as file:
+            encoding = sniff_encoding(file.read(ENCODING_SNIFF_BYTES))
+
+        with ProcessPoolExecutor(max_workers=len(ranges)) as pool:
+            results = list(
+                pool.map(
+                    parse_file_range,
+                    [file_path] * len(ranges),
+                    [start for start, _ in ranges],
+                    [end for _, end in ranges],
+                    [encoding] * len(ranges),
                 )
+            )
+    except Exception as e:
+        print(f"❌ Error loading transactions: {e}")
+        return [], defaultdict(lambda: defaultdict(float))
 
-            # Daily Recommendations header
-            worksheet.format(
-                "K6",
-                {
-                    "textFormat": {"bold": True, "fontSize": 14},
-                    "horizontalAlignment": "CENTER",
-                },
+    for partial_transactions in results:
+        transactions.extend(partial_transactions)
+
+    # Float addition is not associative, so accumulate in file order
+    for transaction in transactions:
+        if transaction["type"] == "expense":
+            daily = daily_categories[transaction["date"]]
+            daily[transaction["category"]] += transaction["amount"]
+
+    print(
+        f"✅ Loaded {len(transactions)} transactions "
+        f"using {len(ranges)} processes"
+    )
+    return transactions, daily_categories
+
+
+def load_transactions(file_path_or_object, stream=False, workers=None):
+    """
+    Load transactions from uploaded file with proper CSV parsing.
+    With stream=True a generator is returned instead of a list; the
+    daily_categories map is filled in as the generator is consumed.
+    Passing workers for a file path parses it in parallel processes.
+    """
+    daily_categories = defaultdict(lambda: defaultdict(float))
+
+    if stream:
+        return (
+            iter_transactions(file_path_or_object, daily_categories),
+            daily_categories,
+        )
+
+    if workers and workers > 1 and not hasattr(file_path_or_object, "read"):
+        return load_transactions_parallel(file_path_or_object, workers)
+
+    try:
+        transactions = list(
+            iter_transactions(file_path_or_object, daily_categories)
+        )
+    except Exception as e:
+        print(f"❌ Error loading transactions: {e}")
+        return [], defaultdict(lambda: defaultdict(float))
+
+    return transactions, daily_categories
+
+
+class TransactionStore:
+    """
+    Compact columnar container for transactions.
+    Amounts live in a NumPy float array, dates are stored as day ordinals,
+    types and categories as small integer codes, and descriptions are
+    dictionary-encoded. Iterating yields the usual transaction dicts, so
+    analyze(), prepare_summary_data() and the Sheets writers keep working.
+    """
+
+    TYPES = ("expense", "income")
+
+    def __init__(self, capacity=1024):
+        capacity = max(int(capacity), 1)
+        self._size = 0
+        self._dates = np.zeros(capacity, dtype=np.int32)
+        self._amounts = np.zeros(capacity, dtype=np.float64)
+        self._type_codes = np.zeros(capacity, dtype=np.int8)
+        self._category_codes = np.zeros(capacity, dtype=np.int16)
+        self._desc_codes = np.zeros(capacity, dtype=np.int32)
+        self.categories = []
+        self._category_index = {}
+        self.descriptions = []
+        self._description_index = {}
+
+    @classmethod
+    def from_transactions(cls, transactions):
+        """Build a store from any iterable of transaction dicts"""
+        store = cls()
+        store.extend(transactions)
+        return store
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        for i in range(self._size):
+            yield self.row(i)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("transaction index out of range")
+        return self.row(index)
+
+    def _grow(self):
+        capacity = len(self._amounts) * 2
+        for name in (
+            "_dates",
+            "_amounts",
+            "_type_codes",
+            "_category_codes",
+            "_desc_codes",
+        ):
+            old = getattr(self, name)
+            grown = np.zeros(capacity, dtype=old.dtype)
+            grown[:self._size] = old[:self._size]
+            setattr(self, name, grown)
+
+    def category_code(self, category):
+        """Return the integer code of a category, registering it if new"""
+        code = self._category_index.get(category)
+        if code is None:
+            code = len(self.categories)
+            self.categories.append(category)
+            self._category_index[category] = code
+        return code
+
+    def _description_code(self, description):
+        code = self._description_index.get(description)
+        if code is None:
+            code = len(self.descriptions)
+            self.descriptions.append(description)
+            self._description_index[description] = code
+        return code
+
+    def append(self, transaction):
+        """Append one transaction dict to the store"""
+        if self._size == len(self._amounts):
+            self._grow()
+
+        i = self._size
+        self._dates[i] = (
+            date.fromisoformat(transaction["date"]).toordinal()
+        )
+        self._amounts[i] = transaction["amount"]
+        self._type_codes[i] = self.TYPES.index(transaction["type"])
+        self._category_codes[i] = self.category_code(transaction["category"])
+        self._desc_codes[i] = self._description_code(transaction["desc"])
+        self._size += 1
+
+    def extend(self, transactions):
+        for transaction in transactions:
+            self.append(transaction)
+
+    @property
+    def dates(self):
+        return self._dates[:self._size]
+
+    @property
+    def amounts(self):
+        return self._amounts[:self._size]
+
+    @property
+    def type_codes(self):
+        return self._type_codes[:self._size]
+
+    @property
+    def category_codes(self):
+        return self._category_codes[:self._size]
+
+    def date_string(self, ordinal):
+        return date.fromordinal(int(ordinal)).isoformat()
+
+    def row(self, index):
+        """Return a single transaction as a dict view"""
+        return {
+            "date": self.date_string(self._dates[index]),
+            "desc": self.descriptions[self._desc_codes[index]],
+            "amount": float(self._amounts[index]),
+            "type": self.TYPES[self._type_codes[index]],
+            "category": self.categories[self._category_codes[index]],
+        }
+
+    def sheet_rows(self, start=0):
+        """Return transaction rows in the month-sheet column order"""
+        date_cache = {}
+        rows = []
+        for i in range(start, self._size):
+            ordinal = int(self._dates[i])
+            date_str = date_cache.get(ordinal)
+            if date_str is None:
+                date_str = self.date_string(ordinal)
+                date_cache[ordinal] = date_str
+            rows.append(
+                [
+                    date_str,
+                    self.descriptions[self._desc_codes[i]][:30],
+                    float(self._amounts[i]),
+                    self.TYPES[self._type_codes[i]],
+                    self.categories[self._category_codes[i]],
+                ]
+            )
+        return rows
+
+    def save(self, file):
+        """Write the columns to an .npz file or file object"""
+        np.savez(
+            file,
+            dates=self.dates,
+            amounts=self.amounts,
+            type_codes=self.type_codes,
+            category_codes=self.category_codes,
+            desc_codes=self._desc_codes[:self._size],
+            categories=np.array(self.categories, dtype=str),
+            descriptions=np.array(self.descriptions, dtype=str),
+        )
+
+    @classmethod
+    def load(cls, file):
+        """Read a store previously written with save()"""
+        with np.load(file, allow_pickle=False) as columns:
+            size = len(columns["amounts"])
+            store = cls(capacity=size)
+            store._dates[:size] = columns["dates"]
+            store._amounts[:size] = columns["amounts"]
+            store._type_codes[:size] = columns["type_codes"]
+            store._category_codes[:size] = columns["category_codes"]
+            store._desc_codes[:size] = columns["desc_codes"]
+            store._size = size
+            for category in columns["categories"].tolist():
+                store.category_code(category)
+            for description in columns["descriptions"].tolist():
+                store._description_code(description)
+        return store
+
+    def daily_categories(self):
+        """Rebuild the per-day expense totals by category"""
+        daily_categories = defaultdict(lambda: defaultdict(float))
+        expense = self.type_codes == self.TYPES.index("expense")
+        for ordinal, code, amount in zip(
+            self.dates[expense],
+            self.category_codes[expense],
+            self.amounts[expense],
+        ):
+            daily = daily_categories[self.date_string(ordinal)]
+            daily[self.categories[code]] += float(amount)
+        return daily_categories
+
+
+def load_transaction_store(file_path_or_object):
+    """Load transactions straight into a columnar TransactionStore"""
+    daily_categories = defaultdict(lambda: defaultdict(float))
+    try:
+        store = TransactionStore.from_transactions(
+            iter_transactions(file_path_or_object, daily_categories)
+        )
+    except Exception as e:
+        print(f"❌ Error loading transactions: {e}")
+        return TransactionStore(), defaultdict(lambda: defaultdict(float))
+
+    return store, daily_categories
+
+
+def upload_cache_key(file_path):
+    """Key an upload by the SHA-256 of its bytes and the rules version"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return f"{digest.hexdigest()}-{CATEGORY_RULES_VERSION}"
+
+
+def evict_upload_cache(cache_dir, max_bytes):
+    """Remove least recently used cache entries until under max_bytes"""
+    entries = []
+    for name in os.listdir(cache_dir):
+        if not name.endswith(".npz"):
+            continue
+        path = os.path.join(cache_dir, name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+
+def load_transaction_store_cached(file_path):
+    """
+    Load an uploaded file through the on-disk parse cache.
+    Repeat uploads of the same bytes under the same category rules are
+    read back from a compact .npz file instead of being parsed again.
+    """
+    try:
+        os.makedirs(UPLOAD_CACHE_DIR, exist_ok=True)
+        key = upload_cache_key(file_path)
+    except OSError as e:
+        print(f"⚠️ Upload cache unavailable: {e}")
+        return load_transaction_store(file_path)
+
+    cache_path = os.path.join(UPLOAD_CACHE_DIR, f"{key}.npz")
+    if os.path.exists(cache_path):
+        try:
+            store = TransactionStore.load(cache_path)
+            os.utime(cache_path)
+            print(f"✅ Loaded {len(store)} transactions from cache")
+            return store, store.daily_categories()
+        except Exception as e:
+            print(f"⚠️ Ignoring unreadable cache entry: {e}")
+
+    store, daily_categories = load_transaction_store(file_path)
+    if not store:
+        return store, daily_categories
+
+    try:
+        fd, temp_path = tempfile.mkstemp(dir=UPLOAD_CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "wb") as file:
+            store.save(file)
+        os.replace(temp_path, cache_path)
+        evict_upload_cache(UPLOAD_CACHE_DIR, UPLOAD_CACHE_MAX_BYTES)
+    except OSError as e:
+        print(f"⚠️ Could not write upload cache: {e}")
+
+    return store, daily_categories
+
+
+class TransactionIndex:
+    """
+    Persistent identity index of ingested transactions, per month.
+    A transaction is identified by its date, signed amount, normalized
+    description and its occurrence ordinal among identical rows of the
+    same upload, hashed to a 64-bit key in an SQLite B-tree, so lookups
+    stay cheap without rescanning history.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def connect(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS transaction_keys ("
+            "month TEXT NOT NULL, key INTEGER NOT NULL, "
+            "PRIMARY KEY (month, key)) WITHOUT ROWID"
+        )
+        return connection
+
+    def transaction_keys(self, transactions):
+        """Return the identity key of each transaction, in order"""
+        occurrences = defaultdict(int)
+        keys = []
+        for t in transactions:
+            if t["type"] == "income":
+                amount = t["amount"]
+            else:
+                amount = -abs(t["amount"])
+            desc = " ".join(t["desc"].lower().split())
+            identity = (t["date"], f"{amount:.2f}", desc)
+            ordinal = occurrences[identity]
+            occurrences[identity] += 1
+
+            payload = "|".join(identity + (str(ordinal),)).encode("utf-8")
+            digest = hashlib.blake2b(payload, digest_size=8).digest()
+            keys.append(int.from_bytes(digest, "big", signed=True))
+        return keys
+
+    def known_keys(self, month, keys):
+        """Return the subset of keys already recorded for a month"""
+        known = set()
+        keys = list(keys)
+        with closing(self.connect()) as connection:
+            for i in range(0, len(keys), 500):
+                batch = keys[i:i + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = connection.execute(
+                    "SELECT key FROM transaction_keys "
+                    f"WHERE month = ? AND key IN ({placeholders})",
+                    [month, *batch],
+                )
+                known.update(row[0] for row in rows)
+        return known
+
+    def filter_new(self, month, transactions):
+        """
+        Drop transactions already recorded for a month.
+        Returns the new transactions and their keys; nothing is recorded
+        until add() is called.
+        """
+        transactions = list(transactions)
+        keys = self.transaction_keys(transactions)
+        known = self.known_keys(month, keys)
+
+        new_transactions = []
+        new_keys = []
+        for transaction, key in zip(transactions, keys):
+            if key not in known:
+                new_transactions.append(transaction)
+                new_keys.append(key)
+        return new_transactions, new_keys
+
+    def add(self, month, keys):
+        """Record keys as ingested for a month"""
+        with closing(self.connect()) as connection, connection:
+            connection.executemany(
+                "INSERT OR IGNORE INTO transaction_keys (month, key) "
+                "VALUES (?, ?)",
+                ((month, key) for key in keys),
+            )
+
+    def replace(self, month, keys):
+        """Make keys the complete set recorded for a month"""
+        with closing(self.connect()) as connection, connection:
+            connection.execute(
+                "DELETE FROM transaction_keys WHERE month = ?", (month,)
+            )
+            connection.executemany(
+                "INSERT OR IGNORE INTO transaction_keys (month, key) "
+                "VALUES (?, ?)",
+                ((month, key) for key in keys),
             )
 
-            # Recommendations headers
-            worksheet.format(
-                "K7:L7",
-                {
-                    "textFormat": {"bold": True, "fontSize": 12},
-                    "backgroundColor": {"red": 0.9, "green": 0.9, "blue": 0.9},
-                    "borders": {
-                        "top": {"style": "SOLID", "width": 1},
-                        "bottom": {"style": "SOLID", "width": 1},
-                        "left": {"style": "SOLID", "width": 1},
-                        "right": {"style": "SOLID", "width": 1},
-                    },
-                },
-            )
 
-            # Recommendations table with alternating colors
-            if last_rec_row > 7:
-                worksheet.format(
-                    f"K8:K{last_rec_row}",
-                    {
-                        "backgroundColor": {
-                            "red": 0.95,
-                            "green": 0.95,
-                            "blue": 0.95,
-                        },
-                        "borders": {
-                            "top": {"style": "SOLID", "width": 1},
-                            "bottom": {"style": "SOLID", "width": 1},
-                            "left": {"style": "SOLID", "width": 1},
-                            "right": {"style": "SOLID", "width": 1},
-                        },
-                    },
-                )
+TRANSACTION_INDEX = TransactionIndex(TRANSACTION_INDEX_PATH)
 
-                worksheet.format(
-                    f"L8:L{last_rec_row}",
-                    {
-                        "backgroundColor": {
-                            "red": 1.0,
-                            "green": 1.0,
-                            "blue": 1.0,
-                        },
-                        "borders": {
-                            "top": {"style": "SOLID", "width": 1},
-                            "bottom": {"style": "SOLID", "width": 1},
-                            "left": {"style": "SOLID", "width": 1},
-                            "right": {"style": "SOLID", "width": 1},
-                        },
-                        "wrapStrategy": "WRAP",
-                    },
-                )
 
-            # Summary section formatting
-            worksheet.format(
-                "A2:A4",
-                {
-                    "textFormat": {"bold": True},
-                    "backgroundColor": {
-                        "red": 0.95,
-                        "green": 0.95,
-                        "blue": 0.95,
-                    },
-                    "borders": {
-                        "top": {"style": "SOLID", "width": 1},
-                        "bottom": {"style": "SOLID", "width": 1},
-                        "left": {"style": "SOLID", "width": 1},
-                        "right": {"style": "SOLID", "width": 1},
-                    },
-                },
-            )
+def drop_known_transactions(month, transactions):
+    """
+    Remove transactions already ingested for a month.
+    Returns the remaining rows as a store, their daily_categories map and
+    their identity keys.
+    """
+    new_transactions, new_keys = TRANSACTION_INDEX.filter_new(
+        get_month_column_name(month), transactions
+    )
+    skipped = len(transactions) - len(new_transactions)
+    if skipped:
+        print(f"🔁 Skipped {skipped} already ingested transactions")
 
-            worksheet.format(
-                "B2:B4",
-                {
-                    "textFormat": {"bold": False},
-                    "backgroundColor": {"red": 1.0, "green": 1.0, "blue": 1.0},
-                    "borders": {
-                        "top": {"style": "SOLID", "width": 1},
-                        "bottom": {"style": "SOLID", "width": 1},
-                        "left": {"style": "SOLID", "width": 1},
-                        "right": {"style": "SOLID", "width": 1},
-                    },
-                    "numberFormat": {
-                        "type": "CURRENCY",
-                        "pattern": "€#,##0.00",
-                    },
-                },
-            )
+    store = TransactionStore.from_transactions(new_transactions)
+    return store, store.daily_categories(), new_keys
 
-            worksheet.format(
-                "C2:C4",
-                {
-                    "textFormat": {"bold": False},
-                    "backgroundColor": {
-                        "red": 0.95,
-                        "green": 0.95,
-                        "blue": 0.95,
-                    },
-                    "borders": {
-                        "top": {"style": "SOLID", "width": 1},
-                        "bottom": {"style": "SOLID", "width": 1},
-                        "left": {"style": "SOLID", "width": 1},
-                        "right": {"style": "SOLID", "width": 1},
-                    },
-                    "numberFormat": {"type": "PERCENT", "pattern": "0.00%"},
-                },
-            )
 
-        except Exception as format_error:
-            print(f"⚠️ Formatting error: {format_error}")
+def month_state_paths(month):
+    """Return the column and totals file paths of a month's stored state"""
+    name = secure_filename(get_month_column_name(month).lower())
+    base = os.path.join(MONTH_STATE_DIR, name)
+    return f"{base}.npz", f"{base}.json"
 
-        # 6. Set column widths
-        try:
-            set_column_width(worksheet, "A", 100)
-            set_column_width(worksheet, "B", 200)
-            set_column_width(worksheet, "C", 80)
-            set_column_width(worksheet, "D", 80)
-            set_column_width(worksheet, "E", 100)
-            set_column_width(worksheet, "G", 150)
-            set_column_width(worksheet, "H", 80)
-            set_column_width(worksheet, "I", 100)
-            set_column_width(worksheet, "K", 90)
-            set_column_width(worksheet, "L", 300)
-
-        except Exception as width_error:
-            print(f"⚠️ Column width error: {width_error}")
 
-        return True
+def load_month_state(month):
+    """Return (store, totals) for a month, or (None, None) if none is stored"""
+    store_path, totals_path = month_state_paths(month)
+    if not (os.path.exists(store_path) and os.path.exists(totals_path)):
+        return None, None
 
+    try:
+        store = TransactionStore.load(store_path)
+        with open(totals_path, "r", encoding="utf-8") as file:
+            totals = json.load(file)
     except Exception as e:
-        print(f"❌ Error writing to {month_name} worksheet: {e}")
-        import traceback
+        print(f"⚠️ Ignoring unreadable state for {month}: {e}")
+        return None, None
+
+    return store, totals
+
+
+def save_month_state(month, store, data):
+    """Persist a month's transactions and aggregates for later appends"""
+    store_path, totals_path = month_state_paths(month)
+    totals = {
+        "income": data["income"],
+        "expenses": data["expenses"],
+        "categories": dict(data["categories"]),
+        "income_categories": dict(data["income_categories"]),
+        "daily_categories": {
+            day: dict(categories)
+            for day, categories in data["daily_categories"].items()
+        },
+    }
 
-        print(f"🔍 Traceback: {traceback.format_exc()}")
+    try:
+        os.makedirs(MONTH_STATE_DIR, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=MONTH_STATE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "wb") as file:
+            store.save(file)
+        os.replace(temp_path, store_path)
+
+        fd, temp_path = tempfile.mkstemp(dir=MONTH_STATE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(totals, file)
+        os.replace(temp_path, totals_path)
+        return True
+    except OSError as e:
+        print(f"⚠️ Could not save state for {month}: {e}")
         return False
 
 
-def sync_google_sheets_operation(month_name, table_data):
-    """Synchronous Google Sheets operation"""
-    try:
-
-        # 1. Authentication
-        creds = get_google_credentials()
-        if not creds:
-            print("❌ No credentials available")
-            return False
+def merge_month_state(month, transactions, daily_categories):
+    """
+    Merge newly uploaded transactions into the stored state of a month.
+    Aggregates are updated from the new rows only. Returns the merged
+    store, its analysis and how many rows the month already had. Raises
+    ValueError when nothing is stored for the month, since writing only
+    the new rows would then wipe the rows already on the month sheet.
+    """
+    if not isinstance(transactions, TransactionStore):
+        transactions = TransactionStore.from_transactions(transactions)
+
+    store, totals = load_month_state(month)
+    if store is None:
+        raise ValueError(
+            f"No stored transactions for {month} to append to. "
+            f"Upload the full statement without append first"
+        )
 
-        gc = gspread.authorize(creds)
+    delta = analyze(transactions, daily_categories, month)
 
-        # 2. Open target spreadsheet by ID
-        try:
-            spreadsheet_key = "1US65_F99qrkqbl2oVkMa4DGUiLacEDRoNz_J9hr2bbQ"
-            target_spreadsheet = gc.open_by_key(spreadsheet_key)
-        except Exception as e:
-            print(f"❌ Error opening spreadsheet: {e}")
-            return False
+    merged_daily = defaultdict(lambda: defaultdict(float))
+    for source in (totals["daily_categories"], daily_categories):
+        for day, categories in source.items():
+            for category, amount in categories.items():
+                merged_daily[day][category] += amount
 
-        try:
-            summary_sheet = target_spreadsheet.worksheet("SUMMARY")
-        except Exception as e:
-            print(f"❌ Error accessing SUMMARY worksheet: {e}")
-            return False
+    data = new_analysis(merged_daily, month)
+    data["income"] = totals["income"] + delta["income"]
+    data["expenses"] = totals["expenses"] + delta["expenses"]
+    for key in ("categories", "income_categories"):
+        for source in (totals[key], delta[key]):
+            for category, amount in source.items():
+                data[key][category] += amount
 
-        # 3. Get current headers
-        headers = summary_sheet.row_values(2)
+    previous_count = len(store)
+    store.extend(transactions)
+    return store, calculate_daily_averages(data), previous_count
 
-        # 4. Normalizing month name for comparison
-        normalized_month = month_name.capitalize()
 
-        # 5. Find the month column
-        month_col = None
-        for i, header in enumerate(headers, 1):
-            if header == normalized_month:
-                month_col = i
-                break
+def summarize_steps(steps):
+    """Derive an operation status from the statuses of its Sheets writes"""
+    details = "; ".join(step.split(" ", 1)[1] for step in steps.values())
+    if any(step.startswith("⏳") for step in steps.values()):
+        return f"⏳ {details}"
+    if any(step.startswith("❌") for step in steps.values()):
+        return f"❌ {details}"
+    if any(step.startswith("⏭️") for step in steps.values()):
+        return f"⏭️ {details}"
+    return "✅ Google Sheets update completed successfully!"
 
-        if month_col is None:
-            print("🔍 No existing column found, looking for empty column...")
-            # Find first empty column
-            for i, header in enumerate(headers, 1):
-                if not header.strip():  # Empty column
-                    month_col = i
-                    print(f"✅ Found empty column at position: {month_col}")
-                    print(f"📝 Creating new column for {normalized_month}...")
-                    summary_sheet.update_cell(2, month_col, normalized_month)
-                    summary_sheet.update_cell(
-                            3,
-                            month_col + 1,
-                            f"{normalized_month} %"
-                        )
-                    print(
-                        f"✅ Created new column for {normalized_month}  "
-                        f"at position: {month_col}"
-                    )
-                    break
 
-        if month_col is None:
-            print("🔍 No empty columns, adding at the end...")
-            # Add new columns at the end
-            month_col = len(headers) + 1
-            if month_col > 37:
-                print("❌ Column limit reached (37)")
-                return False
+class StatusStore:
+    """
+    Operation statuses in an SQLite database in WAL mode, keyed by
+    operation id, so every worker process on the host sees the same
+    status. Each operation also keeps the status of its individual
+    Sheets writes and the timings of its stages. Entries not updated for
+    ttl seconds are treated as gone and purged once a minute on writes.
+    wait() lets status streams sleep until this process writes a status,
+    instead of polling. Jobs are also indexed by a key of their month and
+    upload content, so duplicate submissions find the running operation;
+    operations held by a process get their updated time refreshed by a
+    heartbeat thread, so ones lost in a restart are told apart.
+    """
 
-            print(f"📝 Adding new column at position: {month_col}")
-            summary_sheet.update_cell(2, month_col, normalized_month)
-            summary_sheet.update_cell(
-                3,
-                month_col + 1,
-                f"{normalized_month} %"
+    PURGE_INTERVAL = 60
+
+    def __init__(self, path, ttl):
+        self.path = path
+        self.ttl = float(ttl)
+        self.purged = 0.0
+        self.changes = 0
+        self.changed = threading.Condition()
+        self.live = defaultdict(int)
+        self.live_lock = threading.Lock()
+        self.heartbeat = None
+
+    def connect(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(
+            self.path, timeout=30, isolation_level=None
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS operation_status ("
+            "operation_id TEXT PRIMARY KEY, status TEXT NOT NULL, "
+            "steps TEXT NOT NULL DEFAULT '{}', "
+            "stages TEXT NOT NULL DEFAULT '{}', updated REAL NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS operation_jobs ("
+            "job_key TEXT PRIMARY KEY, operation_id TEXT NOT NULL, "
+            "created REAL NOT NULL) WITHOUT ROWID"
+        )
+        return connection
+
+    def purge(self, connection, now):
+        """Drop expired entries, at most once per PURGE_INTERVAL"""
+        if now - self.purged >= self.PURGE_INTERVAL:
+            connection.execute(
+                "DELETE FROM operation_status WHERE updated < ?",
+                (now - self.ttl,),
             )
-            print(
-                f"✅ Added new column for {normalized_month} "
-                f"at position: {month_col}"
+            connection.execute(
+                "DELETE FROM operation_jobs WHERE created < ?",
+                (now - self.ttl,),
+            )
+            self.purged = now
+
+    def record(self, connection, operation_id):
+        """Return (status, steps, stages) of a live entry, or None"""
+        row = connection.execute(
+            "SELECT status, steps, stages FROM operation_status "
+            "WHERE operation_id = ? AND updated >= ?",
+            (operation_id, time.time() - self.ttl),
+        ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1]), json.loads(row[2])
+
+    def lookup(self, operation_id):
+        with closing(self.connect()) as connection:
+            return self.record(connection, operation_id)
+
+    def update(self, operation_id, status=None, step=None, stage=None):
+        """
+        Change the status, one Sheets write step (kind, message) or one
+        stage timing (name, stats) of an operation in one transaction.
+        A step also re-derives the overall status from all steps.
+        """
+        with closing(self.connect()) as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                current, steps, stages = self.record(
+                    connection, operation_id
+                ) or ("", {}, {})
+                if step is not None:
+                    steps[step[0]] = step[1]
+                    current = summarize_steps(steps)
+                if stage is not None:
+                    stages[stage[0]] = stage[1]
+                if status is not None:
+                    current = status
+
+                now = time.time()
+                connection.execute(
+                    "INSERT OR REPLACE INTO operation_status "
+                    "(operation_id, status, steps, stages, updated) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (
+                        operation_id,
+                        current,
+                        json.dumps(steps),
+                        json.dumps(stages),
+                        now,
+                    ),
+                )
+                self.purge(connection, now)
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+        self.notify()
+
+    def notify(self):
+        with self.changed:
+            self.changes += 1
+            self.changed.notify_all()
+
+    def wait(self, changes, timeout):
+        """
+        Block until a status write after the changes count was seen, or
+        until timeout; returns the current changes count. Writes from
+        other processes are only noticed when the timeout expires.
+        """
+        with self.changed:
+            self.changed.wait_for(lambda: self.changes != changes, timeout)
+            return self.changes
+
+    def __setitem__(self, operation_id, status):
+        self.update(operation_id, status=status)
+
+    def get(self, operation_id, default=None):
+        record = self.lookup(operation_id)
+        return default if record is None else record[0]
+
+    def pop(self, operation_id, default=None):
+        with closing(self.connect()) as connection:
+            record = self.record(connection, operation_id)
+            connection.execute(
+                "DELETE FROM operation_status WHERE operation_id = ?",
+                (operation_id,),
             )
+        self.notify()
+        return default if record is None else record[0]
+
+    def snapshot(self, operation_id):
+        """Return the status JSON of an operation for the status routes"""
+        status, steps, stages = self.lookup(operation_id) or (
+            "Operation not found",
+            {},
+            {},
+        )
+        return {"status": status, "steps": steps, "stages": stages}
+
+    def attach_job(self, job_key, operation_id, status, window):
+        """
+        Register operation_id with its first status as the job for
+        job_key, unless an operation for the same key is still running,
+        with a heartbeat in the last JOB_STALE_AFTER seconds, or succeeded
+        less than window seconds ago. Returns the operation id to follow
+        and whether it belongs to an earlier submission.
+        """
+        now = time.time()
+        with closing(self.connect()) as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = connection.execute(
+                    "SELECT j.operation_id, s.status, s.updated "
+                    "FROM operation_jobs AS j JOIN operation_status AS s "
+                    "ON s.operation_id = j.operation_id "
+                    "WHERE j.job_key = ? AND s.updated >= ?",
+                    (job_key, now - self.ttl),
+                ).fetchone()
+                if row is not None and (
+                    (row[1].startswith("⏳") and now - row[2] < JOB_STALE_AFTER)
+                    or (row[1].startswith("✅") and now - row[2] < window)
+                ):
+                    connection.execute("COMMIT")
+                    return row[0], True
 
-        # 6. Prepare data to be written
-        update_data = []
-        for i, row_data in enumerate(table_data, start=4):
-            if len(row_data) == 3:
-                category, amount, percentage = row_data
-                update_data.append(
-                    {
-                        "range": f"{rowcol_to_a1(i, month_col)}",
-                        "values": [[amount]],
-                    }
+                connection.execute(
+                    "INSERT OR REPLACE INTO operation_jobs "
+                    "(job_key, operation_id, created) VALUES (?, ?, ?)",
+                    (job_key, operation_id, now),
                 )
-                update_data.append(
-                    {
-                        "range": f"{rowcol_to_a1(i, month_col + 1)}",
-                        "values": [[percentage]],
-                    }
+                connection.execute(
+                    "INSERT OR REPLACE INTO operation_status "
+                    "(operation_id, status, updated) VALUES (?, ?, ?)",
+                    (operation_id, status, now),
                 )
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+        self.notify()
+        return operation_id, False
+
+    def hold(self, operation_id):
+        """Refresh an operation's heartbeat until release() is called"""
+        with self.live_lock:
+            self.live[operation_id] += 1
+            if self.heartbeat is None or not self.heartbeat.is_alive():
+                self.heartbeat = threading.Thread(
+                    target=self.beat, daemon=True
+                )
+                self.heartbeat.start()
 
-        # 7. Batch update
-        if update_data:
-            batch_size = 2
-            max_retries = 3
+    def release(self, operation_id):
+        with self.live_lock:
+            self.live[operation_id] -= 1
+            if self.live[operation_id] <= 0:
+                del self.live[operation_id]
 
-            for i in range(0, len(update_data), batch_size):
-                batch = update_data[i:i + batch_size]
-                retry_count = 0
-                success = False
+    @contextmanager
+    def keep_alive(self, operation_id):
+        self.hold(operation_id)
+        try:
+            yield
+        finally:
+            self.release(operation_id)
+
+    def beat(self):
+        """Heartbeat loop refreshing the operations this process holds"""
+        while True:
+            time.sleep(JOB_HEARTBEAT_INTERVAL)
+            with self.live_lock:
+                operation_ids = list(self.live)
+            if not operation_ids:
+                continue
+            try:
+                with closing(self.connect()) as connection:
+                    connection.executemany(
+                        "UPDATE operation_status SET updated = ? "
+                        "WHERE operation_id = ?",
+                        ((time.time(), op) for op in operation_ids),
+                    )
+            except sqlite3.Error as e:
+                print(f"⚠️ Could not refresh operation heartbeats: {e}")
+
+    def release_job(self, job_key, operation_id):
+        """Forget that operation_id runs job_key, e.g. when it was refused"""
+        with closing(self.connect()) as connection:
+            connection.execute(
+                "DELETE FROM operation_jobs "
+                "WHERE job_key = ? AND operation_id = ?",
+                (job_key, operation_id),
+            )
 
-                while not success and retry_count < max_retries:
-                    try:
-                        summary_sheet.batch_update(batch)
-                        success = True
+    def set_step(self, operation_id, kind, message):
+        """Record the status of one Sheets write of an operation"""
+        self.update(operation_id, step=(kind, message))
 
-                    except Exception as e:
-                        if "429" in str(e) or "Quota exceeded" in str(e):
-                            retry_count += 1
-                            wait_time = 60 * retry_count
-                            print(
-                                f"⚠️ Rate limit exceeded. "
-                                f"Retry {retry_count}/{max_retries} "
-                                f"in {wait_time} seconds..."
-                            )
-                            time.sleep(wait_time)
-                        else:
-                            print(f"❌ Error in batch update: {e}")
-                            raise e
+    @contextmanager
+    def stage(self, operation_id, name, **extra):
+        """Time a stage of an operation and record it, even if it fails"""
+        timer = StageTimer(name)
+        try:
+            with timer:
+                yield timer
+        finally:
+            stats = timer.stats()
+            stats.update(extra)
+            self.update(operation_id, stage=(name, stats))
 
-                if not success:
-                    print(
-                        f"❌ Failed to write batch {
-                            i // batch_size + 1} after {max_retries} retries"
-                    )
-                    return False
 
-                if i + batch_size < len(update_data):
-                    time.sleep(15)
+OPERATION_STATUS = StatusStore(STATUS_DB_PATH, STATUS_TTL)
 
-        return True
 
-    except Exception as e:
-        print(f"❌ Error in sync_google_sheets_operation: {e}")
-        import traceback
+def month_state_analysis(month, totals):
+    """Rebuild the analysis dict of a month from its stored totals"""
+    data = new_analysis(totals["daily_categories"], month)
+    data["income"] = totals["income"]
+    data["expenses"] = totals["expenses"]
+    for key in ("categories", "income_categories"):
+        data[key].update(totals[key])
+    return calculate_daily_averages(data)
 
-        print(f"🔍 Traceback: {traceback.format_exc()}")
-        return False
 
+class SheetWriteQueue:
+    """
+    Durable SQLite queue of pending Google Sheets writes, one row per
+    month and kind ("month" or "summary"). Queueing a write that is still
+    pending for the same month replaces it, so only the newest upload is
+    written. A single writer thread per process drains the queue through
+    a small thread pool, running at most one write of each kind at a
+    time, so a month sheet and its SUMMARY column are written together.
+    Each month and kind is leased while one of its writes runs, so
+    workers sharing the file never write the same worksheet at once, even
+    after a newer upload replaced the write; leases left by a restart
+    expire and the rows are picked up again. The queue also records how
+    far each month is confirmed on the sheet, which is what appends
+    continue from.
+    """
 
-def write_to_target_sheet(table_data, month_name):
-    """Write data to target SUMMARY sheet"""
-    try:
-        if not table_data:
-            print("✗ No data to write to target sheet")
-            return False
+    LEASE_SECONDS = 600
+
+    def __init__(self, path, workers=2):
+        self.path = path
+        self.workers = max(int(workers), 1)
+        self.wakeup = threading.Event()
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def connect(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(
+            self.path, timeout=30, isolation_level=None
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS sheet_writes ("
+            "month TEXT NOT NULL, kind TEXT NOT NULL, "
+            "payload TEXT NOT NULL, operation_id TEXT, "
+            "version INTEGER NOT NULL, "
+            "attempts INTEGER NOT NULL DEFAULT 0, "
+            "not_before REAL NOT NULL DEFAULT 0, "
+            "PRIMARY KEY (month, kind))"
+        )
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS sheet_progress ("
+            "month TEXT PRIMARY KEY, "
+            "month_rows INTEGER NOT NULL DEFAULT 0, "
+            "summary_synced INTEGER NOT NULL DEFAULT 0)"
+        )
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS sheet_leases ("
+            "month TEXT NOT NULL, kind TEXT NOT NULL, "
+            "expires REAL NOT NULL, PRIMARY KEY (month, kind))"
+        )
+        return connection
+
+    def enqueue(self, month, kind, payload, operation_id):
+        """
+        Queue a write, coalescing it with a pending one for the same month.
+        Returns the operation_id of the write it replaced, if any.
+        """
+        with closing(self.connect()) as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = connection.execute(
+                    "SELECT payload, operation_id FROM sheet_writes "
+                    "WHERE month = ? AND kind = ?",
+                    (month, kind),
+                ).fetchone()
+                replaced = None
+                if row is not None:
+                    replaced = row[1]
+                    # A full rewrite still pending must not become an
+                    # append
+                    if kind == "month":
+                        payload["full"] = payload["full"] or json.loads(
+                            row[0]
+                        ).get("full", True)
+                if kind == "summary":
+                    self.set_progress(connection, month, summary_synced=0)
+                connection.execute(
+                    "INSERT OR REPLACE INTO sheet_writes "
+                    "(month, kind, payload, operation_id, version) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (
+                        month,
+                        kind,
+                        json.dumps(payload),
+                        operation_id,
+                        time.time_ns(),
+                    ),
+                )
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+
+        self.wakeup.set()
+        return replaced if replaced != operation_id else None
+
+    def set_progress(self, connection, month, **fields):
+        """Update month_rows and/or summary_synced of a month"""
+        connection.execute(
+            "INSERT OR IGNORE INTO sheet_progress (month) VALUES (?)",
+            (month,),
+        )
+        for field, value in fields.items():
+            connection.execute(
+                f"UPDATE sheet_progress SET {field} = ? WHERE month = ?",
+                (value, month),
+            )
 
-        if len(table_data) > 50:
-            print(
-                f"⚠️ Large dataset({
-                    len(table_data)} rows), simplifying update"
+    def progress(self, month):
+        """Return (rows confirmed on the month sheet, SUMMARY confirmed)"""
+        with closing(self.connect()) as connection:
+            row = connection.execute(
+                "SELECT month_rows, summary_synced FROM sheet_progress "
+                "WHERE month = ?",
+                (month,),
+            ).fetchone()
+        return (0, False) if row is None else (row[0], bool(row[1]))
+
+    def confirm(self, month, **fields):
+        """Record what a successful write put on the sheets"""
+        with closing(self.connect()) as connection:
+            self.set_progress(connection, month, **fields)
+
+    def pending(self, month):
+        """Return the kinds still queued for a month"""
+        with closing(self.connect()) as connection:
+            rows = connection.execute(
+                "SELECT kind FROM sheet_writes WHERE month = ?", (month,)
             )
-            simplified_data = []
-            for row in table_data:
-                if row[0] in ["TOTAL INCOME", "TOTAL EXPENSES", "SAVINGS"]:
-                    simplified_data.append(row)
-                elif (
-                    row[0] and
-                    not any(x in row[0] for x in ["CATEGORIES", ""])
-                ):
-                    simplified_data.append([row[0], row[1], 0])
-            table_data = simplified_data
+            return {row[0] for row in rows}
+
+    def claim(self, busy_kinds=()):
+        """
+        Lease the oldest due write not of a busy kind, or return None.
+        Writes whose month and kind are leased by a running write, of any
+        version, wait until it is released.
+        """
+        now = time.time()
+        busy_kinds = list(busy_kinds)
+        placeholders = ",".join("?" * len(busy_kinds))
+        with closing(self.connect()) as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = connection.execute(
+                    "SELECT month, kind, payload, operation_id, version, "
+                    "attempts FROM sheet_writes AS w WHERE not_before <= ? "
+                    f"AND kind NOT IN ({placeholders}) "
+                    "AND NOT EXISTS (SELECT 1 FROM sheet_leases AS l "
+                    "WHERE l.month = w.month AND l.kind = w.kind "
+                    "AND l.expires > ?) "
+                    "ORDER BY version LIMIT 1",
+                    (now, *busy_kinds, now),
+                ).fetchone()
+                if row is not None:
+                    connection.execute(
+                        "INSERT OR REPLACE INTO sheet_leases "
+                        "(month, kind, expires) VALUES (?, ?, ?)",
+                        (row[0], row[1], now + self.LEASE_SECONDS),
+                    )
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+
+        if row is None:
+            return None
+        return {
+            "month": row[0],
+            "kind": row[1],
+            "payload": json.loads(row[2]),
+            "operation_id": row[3],
+            "version": row[4],
+            "attempts": row[5],
+        }
 
-        return sync_google_sheets_operation(month_name, table_data)
+    def complete(self, job):
+        """Drop a written job, unless a newer write replaced it meanwhile"""
+        with closing(self.connect()) as connection:
+            connection.execute(
+                "DELETE FROM sheet_writes "
+                "WHERE month = ? AND kind = ? AND version = ?",
+                (job["month"], job["kind"], job["version"]),
+            )
 
-    except Exception as e:
-        print(f"✗ Error in writing into SUMMARY: {e}")
-        return False
+    def release(self, job):
+        """Give up the lease taken by claim()"""
+        with closing(self.connect()) as connection:
+            connection.execute(
+                "DELETE FROM sheet_leases WHERE month = ? AND kind = ?",
+                (job["month"], job["kind"]),
+            )
 
+    def retry(self, job):
+        """
+        Schedule a failed job again with a growing delay.
+        Returns False once it has used up its attempts and was dropped.
+        """
+        attempts = job["attempts"] + 1
+        if attempts >= WRITE_QUEUE_MAX_ATTEMPTS:
+            self.complete(job)
+            # Nothing of this write is confirmed, so the next one for the
+            # month rewrites it in full
+            if job["kind"] == "month":
+                self.confirm(job["month"], month_rows=0)
+            else:
+                self.confirm(job["month"], summary_synced=0)
+            return False
 
-def load_transactions(file_path_or_object):
-    """Load transactions from uploaded file with proper CSV parsing"""
-    transactions = []
-    daily_categories = defaultdict(lambda: defaultdict(float))
+        with closing(self.connect()) as connection:
+            connection.execute(
+                "UPDATE sheet_writes SET attempts = ?, not_before = ? "
+                "WHERE month = ? AND kind = ? AND version = ?",
+                (
+                    attempts,
+                    time.time() + 60 * attempts,
+                    job["month"],
+                    job["kind"],
+                    job["version"],
+                ),
+            )
+        return True
 
-    try:
-        # Handle both file objects and file paths
-        if hasattr(file_path_or_object, "read"):
-            # File object - rewind to beginning for mobile devices
-            file_path_or_object.seek(0)
+    def pending_kinds(self, operation_id):
+        """Return the kinds still queued for an operation"""
+        with closing(self.connect()) as connection:
+            rows = connection.execute(
+                "SELECT kind FROM sheet_writes WHERE operation_id = ?",
+                (operation_id,),
+            )
+            return {row[0] for row in rows}
+
+    def next_delay(self):
+        """Seconds until the next queued write is due, at most a minute"""
+        with closing(self.connect()) as connection:
+            row = connection.execute(
+                "SELECT MIN(MAX(w.not_before, COALESCE(l.expires, 0))) "
+                "FROM sheet_writes AS w LEFT JOIN sheet_leases AS l "
+                "ON l.month = w.month AND l.kind = w.kind"
+            ).fetchone()
+        if row[0] is None:
+            return 60.0
+        return min(max(row[0] - time.time(), 0.5), 60.0)
+
+    def start(self, handler):
+        """Start the writer thread if it is not running yet"""
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(
+                    target=self.drain, args=(handler,), daemon=True
+                )
+                self.thread.start()
+        self.wakeup.set()
 
-            # Read content in chunks for better memory handling
-            content = b""
+    def drain(self, handler):
+        """Writer loop: start due jobs on free workers, sleep until the next"""
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
             while True:
-                chunk = file_path_or_object.read(8192)  # 8KB chunks
-                if not chunk:
-                    break
-                content += chunk
+                self.wakeup.clear()
+                for future in [f for f in running if f.done()]:
+                    del running[future]
 
-            if isinstance(content, bytes):
+                delay = 60.0
                 try:
-                    content = content.decode("utf-8")
-                except UnicodeDecodeError:
-                    # Try other encodings if UTF-8 fails
-                    try:
-                        content = content.decode("latin-1")
-                    except Exception:
-                        print("❌ Error decoding file content")
-                        return [], defaultdict(lambda: defaultdict(float))
+                    while len(running) < self.workers:
+                        job = self.claim(running.values())
+                        if job is None:
+                            delay = self.next_delay()
+                            break
+                        future = pool.submit(self.run, handler, job)
+                        running[future] = job["kind"]
+                        future.add_done_callback(
+                            lambda _: self.wakeup.set()
+                        )
+                except sqlite3.Error as e:
+                    print(f"⚠️ Sheets write queue unavailable: {e}")
+
+                self.wakeup.wait(delay)
+
+    def run(self, handler, job):
+        """Run one job and complete or reschedule it"""
+        try:
+            with OPERATION_STATUS.keep_alive(job["operation_id"]):
+                success = handler(job)
+        except Exception as e:
+            print(f"❌ Queued {job['kind']} write failed: {e}")
+            success = False
+
+        try:
+            if success:
+                self.complete(job)
+            elif not self.retry(job):
+                print(
+                    f"❌ Giving up on {job['kind']} write "
+                    f"for {job['month']}"
+                )
+            self.release(job)
+        except sqlite3.Error as e:
+            print(f"⚠️ Could not update Sheets write queue: {e}")
+
+
+SHEET_WRITE_QUEUE = SheetWriteQueue(WRITE_QUEUE_PATH, SHEET_WRITE_WORKERS)
 
-            lines = content.splitlines()
+
+def perform_sheet_write(job):
+    """Run one queued month-sheet or SUMMARY write and report its status"""
+    month = job["month"]
+    kind = job["kind"]
+    operation_id = job["operation_id"]
+    label = "Month sheet" if kind == "month" else "Summary"
+    OPERATION_STATUS.set_step(operation_id, kind, f"⏳ Writing {label}...")
+
+    stage_name = "month_sheet" if kind == "month" else "summary_sheet"
+    with OPERATION_STATUS.stage(
+        operation_id,
+        stage_name,
+        attempt=job["attempts"] + 1,
+        queued_seconds=round(time.time() - job["version"] / 1e9, 3),
+    ):
+        if kind == "month":
+            store, totals = load_month_state(month)
+            if store is None:
+                print(f"⚠️ No stored state for {month}, skipping month write")
+                OPERATION_STATUS.set_step(
+                    operation_id, kind, f"✅ {label} skipped"
+                )
+                return True
+            data = month_state_analysis(month, totals)
+
+            # Append after the rows confirmed on the sheet, not after the
+            # stored state, which may be ahead of it
+            confirmed_rows, _ = SHEET_WRITE_QUEUE.progress(month)
+            full = job["payload"].get(
+                "full", not job["payload"].get("previous_count")
+            )
+            if full or confirmed_rows > len(store):
+                confirmed_rows = 0
+
+            success = get_output_sink().write_month(
+                month, store, data, confirmed_rows
+            )
+            if success:
+                SHEET_WRITE_QUEUE.confirm(month, month_rows=len(store))
         else:
-            # File path
-            try:
-                with open(file_path_or_object, "r", encoding="utf-8") as file:
-                    lines = file.readlines()
-            except UnicodeDecodeError:
-                # Try other encodings
-                try:
-                    with open(
-                        file_path_or_object, "r", encoding="latin-1"
-                            ) as file:
-                        lines = file.readlines()
-                except Exception as e:
-                    print(f"❌ Error reading file: {e}")
-                    return [], defaultdict(lambda: defaultdict(float))
+            success = get_output_sink().write_summary(
+                job["payload"]["table_data"], get_month_column_name(month)
+            )
+            if success:
+                SHEET_WRITE_QUEUE.confirm(month, summary_synced=1)
+
+    if success:
+        OPERATION_STATUS.set_step(operation_id, kind, f"✅ {label} updated")
+    elif job["attempts"] + 1 >= WRITE_QUEUE_MAX_ATTEMPTS:
+        print(f"❌ Failed to update {label} for {month}")
+        OPERATION_STATUS.set_step(
+            operation_id, kind, f"❌ Failed to update {label}"
+        )
+    else:
+        print(f"❌ Failed to update {label} for {month}, will retry")
+        OPERATION_STATUS.set_step(
+            operation_id, kind, f"⏳ {label} update failed, retrying..."
+        )
 
-        # Parse CSV lines
-        for line_num, line in enumerate(lines, 1):
-            line = line.strip()
-            if line and not line.startswith(("#", "Date", "Date,")):
-                try:
-                    # More robust CSV parsing
-                    parts = [part.strip() for part in line.split(",")]
-                    if len(parts) < 5:
-                        continue
-
-                    # Parse date (assuming format: "31 Mar 2025")
-                    date_str = parts[0]
-                    description = parts[1]
-
-                    try:
-                        amount = float(parts[2])
-                    except ValueError:
-                        continue
-
-                    currency = parts[3]
-                    transaction_type = parts[4].lower()
-
-                    # Convert date to standard format
-                    try:
-                        date_obj = datetime.strptime(date_str, "%d %b %Y")
-                        date_formatted = date_obj.strftime("%Y-%m-%d")
-                    except ValueError:
-                        # Try other date formats if needed
-                        continue
-
-                    # Categorize
-                    category = categorize(description)
-
-                    transaction = {
-                        "date": date_formatted,
-                        "desc": description[:30],
-                        "amount": amount,
-                        "type": (
-                            "income"
-                            if transaction_type == "credit"
-                            else "expense"
-                        ),
-                        "category": category,
-                    }
+    return success
 
-                    transactions.append(transaction)
 
-                    # Track daily categories for expenses
-                    if transaction_type != "credit":
-                        daily = daily_categories[date_formatted]
-                        daily[category] += amount
+def queue_sheet_writes(month, operation_id, full, table_data):
+    """
+    Queue the month-sheet and SUMMARY writes of an analysed upload.
+    With full=False the month write only appends the rows the sheet
+    does not have yet.
+    """
+    for kind, label, payload in (
+        ("month", "Month sheet", {"full": full}),
+        ("summary", "Summary", {"table_data": table_data}),
+    ):
+        OPERATION_STATUS.set_step(operation_id, kind, f"⏳ {label} queued")
+        replaced = SHEET_WRITE_QUEUE.enqueue(
+            month, kind, payload, operation_id
+        )
+        if replaced:
+            OPERATION_STATUS.set_step(
+                replaced,
+                kind,
+                f"⏭️ {label} superseded by a newer upload for {month}",
+            )
+    SHEET_WRITE_QUEUE.start(perform_sheet_write)
 
-                except (ValueError, IndexError) as e:
-                    print(f"⚠️ Warning: Error parsing line {line_num}: {e}")
-                    continue
 
-    except Exception as e:
-        print(f"❌ Error loading transactions: {e}")
-        return [], defaultdict(lambda: defaultdict(float))
+def resync_month_sheets(month, operation_id):
+    """
+    Queue a full rewrite of a month from its stored state when the sheets
+    are not confirmed to hold it and no write is pending; returns whether
+    anything was queued.
+    """
+    store, totals = load_month_state(month)
+    if store is None or SHEET_WRITE_QUEUE.pending(month):
+        return False
 
-    print(f"✅ Loaded {len(transactions)} transactions")
-    return transactions, daily_categories
+    month_rows, summary_synced = SHEET_WRITE_QUEUE.progress(month)
+    if month_rows == len(store) and summary_synced:
+        return False
+
+    print(f"🔁 {month} sheets are behind the stored state, rewriting them")
+    data = month_state_analysis(month, totals)
+    queue_sheet_writes(month, operation_id, True, prepare_summary_data(data))
+    return True
 
 
 def get_operation_status(
@@ -1474,13 +4040,23 @@ def get_operation_status(
         return "❌ All operations failed"
 
 
-def run_full_analysis_with_file(month, file_path, temp_dir, operation_id):
-    """Full processing in background mode using uploaded file"""
+def run_full_analysis_with_file(
+    month, file_path, temp_dir, operation_id, append=False
+):
+    """
+    Full processing in background mode using uploaded file.
+    With append=True the upload is merged into the stored month state and
+    only the new rows are written to the month worksheet. The Sheets
+    writes themselves are queued for the write queue's writer thread, so
+    this returns whether the analysis succeeded and whether the month
+    sheet and SUMMARY writes were queued; their outcome is reported
+    through OPERATION_STATUS.
+    """
     global OPERATION_STATUS
 
     analysis_success = False
-    month_sheet_success = False
-    summary_sheet_success = False
+    month_sheet_queued = False
+    summary_sheet_queued = False
 
     OPERATION_STATUS[operation_id] = (
         "⏳ Processing started... Google Sheets update in background"
@@ -1491,13 +4067,40 @@ def run_full_analysis_with_file(month, file_path, temp_dir, operation_id):
             f"🚀 Starting FULL background analysis "
             f"for {month} with uploaded file"
         )
-        transactions, daily_categories = load_transactions(file_path)
+        with OPERATION_STATUS.stage(operation_id, "load"):
+            transactions, daily_categories = load_transaction_store_cached(
+                file_path
+            )
 
         if not transactions:
             print("No transactions found in uploaded file")
-            return analysis_success, month_sheet_success, summary_sheet_success
+            return analysis_success, month_sheet_queued, summary_sheet_queued
 
-        data = analyze(transactions, daily_categories, month)
+        full = True
+        with OPERATION_STATUS.stage(operation_id, "analyze"):
+            if append:
+                transactions, daily_categories, new_keys = (
+                    drop_known_transactions(month, transactions)
+                )
+                if transactions:
+                    transactions, data, _ = merge_month_state(
+                        month, transactions, daily_categories
+                    )
+                    full = False
+            else:
+                new_keys = TRANSACTION_INDEX.transaction_keys(transactions)
+                data = analyze(transactions, daily_categories, month)
+
+        if not transactions:
+            print("No new transactions to append")
+            # Rows ingested by an earlier upload whose Sheets write was
+            # given up still have to reach the sheets
+            if resync_month_sheets(month, operation_id):
+                return True, True, True
+            OPERATION_STATUS[operation_id] = (
+                "✅ No new transactions - month already up to date"
+            )
+            return True, False, False
         analysis_success = True
 
         print(f"{month.upper()} ANALYSIS COMPLETED")
@@ -1505,42 +4108,32 @@ def run_full_analysis_with_file(month, file_path, temp_dir, operation_id):
         print(f"Expenses: {data['expenses']:.2f}€")
         print(f"Savings: {data['savings']:.2f}€")
 
-        # 1. Writing into month sheet
-        print(f"📝 Writing to {month} worksheet...")
-        month_sheet_success = write_to_month_sheet(month, transactions, data)
-        if month_sheet_success:
-            OPERATION_STATUS[operation_id] = (
-                "⏳ Month sheet updated, updating Summary..."
-            )
-        else:
-            print(f"❌ Failed to update {month} worksheet")
-            error_message = "❌ Failed to update Month worksheet"
-            OPERATION_STATUS[operation_id] = error_message
-
-        time.sleep(10)
-
-        # 2. Writing into Summary sheet
-        print("⏳ Starting Google Sheets SUMMARY update...")
-        table_data = prepare_summary_data(data, transactions)
-        MONTH_NORMALIZED = get_month_column_name(month)
-        summary_sheet_success = write_to_target_sheet(
-            table_data, MONTH_NORMALIZED
-        )
-
-        if summary_sheet_success:
+        # 1. Persist the month before any Sheets write, so queued writes
+        # survive a restart and read the newest state
+        with OPERATION_STATUS.stage(operation_id, "save_state"):
+            saved = save_month_state(month, transactions, data)
+            if saved:
+                month_key = get_month_column_name(month)
+                if append:
+                    TRANSACTION_INDEX.add(month_key, new_keys)
+                else:
+                    TRANSACTION_INDEX.replace(month_key, new_keys)
 
+        if not saved:
             OPERATION_STATUS[operation_id] = (
-                "✅ Google Sheets update completed successfully!"
+                "❌ Could not save month state for Google Sheets"
             )
-        else:
-            print("❌ Failed to update Google Sheets SUMMARY")
-            OPERATION_STATUS[operation_id] = "❌ Failed to update Google Sheets"
+            return analysis_success, month_sheet_queued, summary_sheet_queued
 
-        # Printing status message
-        status_message = get_operation_status(
-            analysis_success, month_sheet_success, summary_sheet_success
-        )
-        print(f"🎉 {status_message}")
+        # 2. Queue the month sheet and SUMMARY writes
+        # Merged month state already carries its category totals
+        with OPERATION_STATUS.stage(operation_id, "queue"):
+            table_data = prepare_summary_data(
+                data, None if append else transactions
+            )
+            queue_sheet_writes(month, operation_id, full, table_data)
+        month_sheet_queued = summary_sheet_queued = True
+        print(f"📝 Queued Google Sheets writes for {month}")
 
     except Exception as e:
         print(f"Background analysis error: {e}")
@@ -1550,6 +4143,8 @@ def run_full_analysis_with_file(month, file_path, temp_dir, operation_id):
         print(f"Traceback: {traceback.format_exc()}")
 
     finally:
+        OPERATION_STATUS.release(operation_id)
+
         # Clearing temporary data
         try:
             if os.path.exists(temp_dir):
@@ -1558,7 +4153,47 @@ def run_full_analysis_with_file(month, file_path, temp_dir, operation_id):
         except Exception as cleanup_error:
             print(f"Error cleaning up temporary files: {cleanup_error}")
 
-    return analysis_success, month_sheet_success, summary_sheet_success
+    return analysis_success, month_sheet_queued, summary_sheet_queued
+
+
+class AnalysisJobPool:
+    """
+    Fixed-size thread pool for background analysis jobs with a bounded
+    backlog. submit() refuses a job once every worker is busy and the
+    backlog is full, so a burst of uploads cannot pile up threads.
+    """
+
+    def __init__(self, workers, backlog):
+        self.workers = max(int(workers), 1)
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="analysis"
+        )
+        self.slots = threading.BoundedSemaphore(
+            self.workers + max(int(backlog), 0)
+        )
+        self.lock = threading.Lock()
+        self.pending = 0
+
+    def submit(self, fn, *args):
+        """Run fn(*args); returns started, queued or rejected"""
+        if not self.slots.acquire(blocking=False):
+            return "rejected"
+
+        with self.lock:
+            self.pending += 1
+            queued = self.pending > self.workers
+
+        future = self.executor.submit(fn, *args)
+        future.add_done_callback(self.release)
+        return "queued" if queued else "started"
+
+    def release(self, future):
+        with self.lock:
+            self.pending -= 1
+        self.slots.release()
+
+
+ANALYSIS_POOL = AnalysisJobPool(ANALYSIS_WORKERS, ANALYSIS_BACKLOG)
 
 
 @app.route("/", methods=["GET", "POST"])
@@ -1570,6 +4205,9 @@ def index():
     operation_id = None
 
     try:
+        # Resume Sheets writes queued before a restart
+        SHEET_WRITE_QUEUE.start(perform_sheet_write)
+
         if request.method == "POST":
             print("📨 POST request received")
 
@@ -1580,6 +4218,7 @@ def index():
                 time.sleep(3)  # 3 second delay for mobile devices
 
             month = request.form.get("month", "").strip().lower()
+            append = request.form.get("mode") == "append"
 
             if not month:
                 return render_template(
@@ -1652,37 +4291,95 @@ def index():
                     file.save(temp_file_path)
 
                     # Load transactions for immediate display
-                    transactions, daily_categories = load_transactions(
-                            temp_file_path
-                        )
+                    transactions, daily_categories = (
+                        load_transaction_store_cached(temp_file_path)
+                    )
 
                     if transactions:
-                        data = analyze(transactions, daily_categories, month)
+                        if append:
+                            # Preview the month totals including new rows
+                            new_rows, new_daily, _ = drop_known_transactions(
+                                month, transactions
+                            )
+                            _, data, _ = merge_month_state(
+                                month, new_rows, new_daily
+                            )
+                        else:
+                            data = analyze(
+                                transactions, daily_categories, month
+                            )
                         result = format_terminal_output(
                                     data,
                                     month,
                                     len(transactions)
                                 )
 
-                        # Generate unique operation ID
+                        # Generate unique operation ID; the random suffix
+                        # keeps uploads made in the same second apart
                         operation_id = f"{month}_{
-                            datetime.now().strftime('%Y%m%d_%H%M%S')}"
+                            datetime.now().strftime('%Y%m%d_%H%M%S')}_{
+                            os.urandom(3).hex()}"
+
+                        # The same file for the same month follows the
+                        # job already submitted for it
+                        job_key = ":".join(
+                            [
+                                get_month_column_name(month),
+                                "append" if append else "replace",
+                                upload_cache_key(temp_file_path),
+                            ]
+                        )
+                        operation_id, duplicate = OPERATION_STATUS.attach_job(
+                            job_key,
+                            operation_id,
+                            "⏳ Queued, waiting for a free worker...",
+                            JOB_DEDUP_WINDOW,
+                        )
 
-                        # Start background processing
-                        thread = threading.Thread(
-                            target=run_full_analysis_with_file,
-                            args=(
+                        # Start background processing, or wait for a
+                        # free worker
+                        if duplicate:
+                            shutil.rmtree(temp_dir, ignore_errors=True)
+                            state = "duplicate"
+                        else:
+                            # Released by run_full_analysis_with_file
+                            # once the job is over
+                            OPERATION_STATUS.hold(operation_id)
+                            state = ANALYSIS_POOL.submit(
+                                run_full_analysis_with_file,
                                 month,
                                 temp_file_path,
                                 temp_dir,
                                 operation_id,
-                            ),
-                        )
-                        thread.daemon = True
-                        thread.start()
+                                append,
+                            )
 
-                        status_message = f"⏳ Processing started... "
-                        f"Operation ID: {operation_id}"
+                        if state == "rejected":
+                            OPERATION_STATUS.release(operation_id)
+                            OPERATION_STATUS.pop(operation_id, None)
+                            OPERATION_STATUS.release_job(job_key, operation_id)
+                            operation_id = None
+                            shutil.rmtree(temp_dir, ignore_errors=True)
+                            status_message = (
+                                "❌ Too many uploads in progress, "
+                                "please try again in a minute"
+                            )
+                        elif state == "duplicate":
+                            print(
+                                f"🔁 Duplicate upload, following "
+                                f"operation {operation_id}"
+                            )
+                            status_message = (
+                                f"🔁 Same upload already submitted. "
+                                f"Operation ID: {operation_id}"
+                            )
+                        elif state == "queued":
+                            status_message = (
+                                "⏳ Queued, waiting for a free worker..."
+                            )
+                        else:
+                            status_message = f"⏳ Processing started... "
+                            f"Operation ID: {operation_id}"
                     else:
                         result = f"No valid transactions found in {filename}"
                         status_message = (
@@ -1731,8 +4428,57 @@ def internal_error(error):
 def check_status(operation_id):
     """Check the status of a background operation"""
     global OPERATION_STATUS
-    status = OPERATION_STATUS.get(operation_id, "Operation not found")
-    return {"status": status}
+    return OPERATION_STATUS.snapshot(operation_id)
+
+
+@app.route("/status/<operation_id>/stream")
+def stream_status(operation_id):
+    """
+    Push the status of a background operation as server-sent events.
+    The stream sleeps until a status is written, sends each change once
+    and ends when the operation is no longer in progress. Once
+    STATUS_STREAM_MAX streams are open, 503 is returned and the browser
+    polls /status/<operation_id> instead.
+    """
+    if STATUS_STREAM_MAX < 1 or not STATUS_STREAM_SLOTS.acquire(
+        blocking=False
+    ):
+        return Response(
+            "Too many status streams, poll /status instead",
+            status=503,
+            headers={"Retry-After": "5"},
+        )
+
+    def events():
+        last = None
+        deadline = time.monotonic() + STATUS_STREAM_TIMEOUT
+        changes = OPERATION_STATUS.changes
+        while True:
+            payload = OPERATION_STATUS.snapshot(operation_id)
+            if payload != last:
+                yield f"data: {json.dumps(payload)}\n\n"
+                last = payload
+                if "⏳" not in payload["status"]:
+                    return
+            else:
+                # Keeps proxies from closing an idle connection
+                yield ": keep-alive\n\n"
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            changes = OPERATION_STATUS.wait(
+                changes, min(STATUS_STREAM_POLL, remaining)
+            )
+
+    response = Response(
+        events(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+    # Runs when the stream ends or the browser goes away
+    response.call_on_close(STATUS_STREAM_SLOTS.release)
+    return response
 
 
 def main():
@@ -1749,7 +4495,7 @@ def main():
         FILE = f"hsbc_{MONTH}.csv"
         print(f"Loading file: {FILE}")
 
-        transactions, daily_categories = load_transactions(FILE)
+        transactions, daily_categories = load_transaction_store_cached(FILE)
         if not transactions:
             print(f"No transactions found")
             sys.exit(1)
@@ -1759,21 +4505,21 @@ def main():
 
         print("=" * 50)
 
+        sink = get_output_sink()
+
         # 1. Writing into month sheet
-        monthly_success = write_to_month_sheet(MONTH, transactions, data)
+        monthly_success = sink.write_month(MONTH, transactions, data)
         if monthly_success:
             print(f"✅ Successfully updated {MONTH} worksheet")
         else:
             print(f"❌ Failed to update {MONTH} worksheet")
 
-        time.sleep(10)
-
         # 2. Writing into Summary sheet
         print("⏳ Writing to Google Sheets SUMMARY...")
         table_data = prepare_summary_data(data, transactions)
         MONTH_NORMALIZED = get_month_column_name(MONTH)
 
-        success = write_to_target_sheet(table_data, MONTH_NORMALIZED)
+        success = sink.write_summary(table_data, MONTH_NORMALIZED)
 
         if success:
             print("✅ Google Sheets update completed successfully!")
@@ -1782,7 +4528,23 @@ def main():
 
 
 if __name__ == "__main__":
-    if "DYNO" in os.environ:
+    if "--benchmark-dates" in sys.argv:
+        benchmark_date_normalization()
+    elif "--export" in sys.argv:
+        # python run.py --export csv|sqlite|sheets hsbc_march.csv ...
+        position = sys.argv.index("--export")
+        sink_name, *file_paths = sys.argv[position + 1:] or [None]
+        missing = [path for path in file_paths if not os.path.isfile(path)]
+        if sink_name not in OUTPUT_SINKS or not file_paths or missing:
+            for path in missing:
+                print(f"❌ File not found: {path}")
+            print(
+                f"Usage: python run.py --export "
+                f"{'|'.join(OUTPUT_SINKS)} hsbc_<month>.csv ..."
+            )
+            sys.exit(2)
+        sys.exit(0 if export_reports(file_paths, sink_name) else 1)
+    elif "DYNO" in os.environ:
         # Heroku mode
         port = int(os.environ.get("PORT", 5000))
         app.run(host="0.0.0.0", port=port)
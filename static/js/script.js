@@ -79,23 +79,35 @@ function optimizeForMobile() {
 }
 
 function checkOperationStatus(operationId) {
+    if (!window.EventSource) {
+        pollOperationStatus(operationId);
+        return;
+    }
+
+    // The server pushes every status change; the browser reconnects by
+    // itself when a long-running stream ends. A server with all its
+    // stream slots taken answers 503, which closes the source and falls
+    // back to polling
+    const source = new EventSource('/status/' + operationId + '/stream');
+    source.onmessage = event => {
+        const data = JSON.parse(event.data);
+        if (!showOperationStatus(data.status)) {
+            source.close();
+        }
+    };
+    source.onerror = () => {
+        if (source.readyState === EventSource.CLOSED) {
+            pollOperationStatus(operationId);
+        }
+    };
+}
+
+function pollOperationStatus(operationId) {
     fetch('/status/' + operationId)
         .then(response => response.json())
         .then(data => {
-            const statusElement = document.getElementById('statusMessage');
-            if (statusElement) {
-                statusElement.textContent = data.status;
-
-                if (data.status.includes('✅')) {
-                    statusElement.className = 'status status-success';
-                } else if (data.status.includes('❌')) {
-                    statusElement.className = 'status status-error';
-                } else if (data.status.includes('⏳')) {
-                    statusElement.className = 'status status-loading';
-                    setTimeout(() => checkOperationStatus(operationId), 5000);
-                } else if (data.status.includes('⚠️')) {
-                    statusElement.className = 'status status-warning';
-                }
+            if (showOperationStatus(data.status)) {
+                setTimeout(() => pollOperationStatus(operationId), 5000);
             }
         })
         .catch(error => {
@@ -103,6 +115,27 @@ function checkOperationStatus(operationId) {
         });
 }
 
+// Shows a status message; returns true while the operation is running
+function showOperationStatus(status) {
+    const statusElement = document.getElementById('statusMessage');
+    if (!statusElement) {
+        return false;
+    }
+    statusElement.textContent = status;
+
+    if (status.includes('✅')) {
+        statusElement.className = 'status status-success';
+    } else if (status.includes('❌')) {
+        statusElement.className = 'status status-error';
+    } else if (status.includes('⏳')) {
+        statusElement.className = 'status status-loading';
+        return true;
+    } else if (status.includes('⚠️')) {
+        statusElement.className = 'status status-warning';
+    }
+    return false;
+}
+
 // Handle window resize
 window.addEventListener('resize', function() {
     optimizeForMobile();
@@ -0,0 +1,77 @@
+"""Check that the vectorized analysis engine matches analyze()"""
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import run  # noqa: E402
+
+SAMPLE_FILES = ["hsbc_march.csv", "hsbc_april.csv", "hsbc_may.csv"]
+
+
+def comparable(analysis):
+    """Turn an analysis dict into plain values, keeping category order"""
+    return {
+        key: list(value.items()) if isinstance(value, dict) else value
+        for key, value in analysis.items()
+        if key != "daily_categories"
+    }
+
+
+class VectorizedAnalysisTest(unittest.TestCase):
+    def assert_same_analysis(self, transactions, month="March"):
+        daily_categories = {}
+        expected = run.analyze(list(transactions), daily_categories, month)
+        store = run.TransactionStore.from_transactions(transactions)
+        actual = run.analyze(store, daily_categories, month)
+        self.assertEqual(comparable(actual), comparable(expected))
+
+    def test_sample_files(self):
+        for name in SAMPLE_FILES:
+            with self.subTest(file=name):
+                transactions, _ = run.load_transactions(
+                    os.path.join(ROOT, name)
+                )
+                self.assertTrue(transactions)
+                self.assert_same_analysis(transactions)
+
+    def test_empty_input(self):
+        self.assert_same_analysis([])
+
+    def test_single_category(self):
+        transactions = [
+            {
+                "date": f"2025-03-{day:02d}",
+                "desc": "TESCO STORES",
+                "amount": -(day * 1.1),
+                "type": "expense",
+                "category": "Groceries",
+            }
+            for day in range(1, 29)
+        ]
+        self.assert_same_analysis(transactions)
+
+    def test_single_income_category(self):
+        transactions = [
+            {
+                "date": "2025-03-01",
+                "desc": "SALARY",
+                "amount": 2500.1,
+                "type": "income",
+                "category": "Salary",
+            },
+            {
+                "date": "2025-03-15",
+                "desc": "SALARY",
+                "amount": 0.2,
+                "type": "income",
+                "category": "Salary",
+            },
+        ]
+        self.assert_same_analysis(transactions)
+
+
+if __name__ == "__main__":
+    unittest.main()
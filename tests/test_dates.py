@@ -0,0 +1,46 @@
+"""Check the memoized statement date normalizer"""
+import os
+import sys
+import threading
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import run  # noqa: E402
+
+
+class DateNormalizerTest(unittest.TestCase):
+    def test_formats(self):
+        normalizer = run.DateNormalizer()
+        self.assertEqual(normalizer.normalize("31 Mar 2025"), "2025-03-31")
+        self.assertEqual(normalizer.normalize("1 mar 2025"), "2025-03-01")
+        self.assertIsNone(normalizer.normalize("31 Feb 2025"))
+        self.assertIsNone(normalizer.normalize("yesterday"))
+
+    def test_counters_under_threads(self):
+        normalizer = run.DateNormalizer()
+        dates = [f"{day:02d} Mar 2025" for day in range(1, 32)]
+        threads = 8
+        rounds = 200
+
+        def work():
+            for _ in range(rounds):
+                for date_str in dates:
+                    normalizer.normalize(date_str)
+
+        workers = [threading.Thread(target=work) for _ in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        stats = normalizer.stats()
+        self.assertEqual(
+            stats["hits"] + stats["misses"], threads * rounds * len(dates)
+        )
+        self.assertEqual(stats["size"], len(dates))
+
+
+if __name__ == "__main__":
+    unittest.main()
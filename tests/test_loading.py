@@ -0,0 +1,169 @@
+"""Check that the parallel loader matches load_transactions()"""
+import io
+import os
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import run  # noqa: E402
+
+
+def plain(daily_categories):
+    """Turn nested defaultdicts into plain dicts"""
+    return {day: dict(totals) for day, totals in daily_categories.items()}
+
+
+SAMPLE_LINES = [
+    "Date,Description,Amount,Currency,Type,Status",
+    "31 Mar 2025,Monthly Rent Payment,1200.00,EUR,Debit,SETTLED",
+    "30 Mar 2025,Netflix Subscription,12.99,EUR,Debit,SETTLED",
+    "29 Mar 2025,Salary Payment,2500.00,EUR,Credit,SETTLED",
+]
+
+
+class LineBreakTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.expected, _ = run.load_transactions(
+            io.BytesIO("\n".join(SAMPLE_LINES).encode("utf-8"))
+        )
+        self.assertEqual(len(self.expected), 3)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def write(self, newline):
+        path = os.path.join(self.temp_dir, "transactions.csv")
+        with open(path, "wb") as file:
+            file.write((newline.join(SAMPLE_LINES) + newline).encode())
+        return path
+
+    def test_line_endings(self):
+        for newline in ("\n", "\r\n", "\r"):
+            with self.subTest(newline=repr(newline)):
+                path = self.write(newline)
+                transactions, _ = run.load_transactions(path)
+                self.assertEqual(transactions, self.expected)
+
+                with open(path, "rb") as file:
+                    transactions, _ = run.load_transactions(file)
+                self.assertEqual(transactions, self.expected)
+
+    def test_line_endings_across_blocks(self):
+        for newline in ("\r\n", "\r"):
+            for size in range(1, 80):
+                with self.subTest(newline=repr(newline), size=size):
+                    path = self.write(newline)
+                    mapped = [
+                        fields
+                        for fields in run.iter_mapped_fields(
+                            path, block_size=size
+                        )
+                        if fields is not None
+                    ]
+                    with open(path, "rb") as file:
+                        decoded = [
+                            fields
+                            for fields in map(
+                                run.line_fields,
+                                run.iter_decoded_lines(file, size),
+                            )
+                            if fields is not None
+                        ]
+                    self.assertEqual(len(mapped), 3)
+                    self.assertEqual(
+                        [fields[:5] for fields in decoded], mapped
+                    )
+
+
+class ParallelLoaderTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.min_range_bytes = run.PARALLEL_MIN_RANGE_BYTES
+        # Small ranges so a test-sized file is split across processes
+        run.PARALLEL_MIN_RANGE_BYTES = 1024
+
+    def tearDown(self):
+        run.PARALLEL_MIN_RANGE_BYTES = self.min_range_bytes
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def write_csv(self, rows=3000, seed=6):
+        rng = random.Random(seed)
+        descriptions = [
+            "Grocery Store (Carrefour)",
+            "Netflix Subscription",
+            "Salary Payment",
+            "Dentist Visit",
+        ]
+        path = os.path.join(self.temp_dir, "transactions.csv")
+        with open(path, "w", encoding="utf-8") as file:
+            for _ in range(rows):
+                file.write(
+                    f"{rng.randint(1, 28):02d} Mar 2025,"
+                    f"{rng.choice(descriptions)},"
+                    f"{rng.randint(1, 99999) / 100:.2f},EUR,"
+                    f"{rng.choice(['Debit', 'Debit', 'Credit'])},SETTLED\n"
+                )
+        return path
+
+    def test_matches_sequential_loader(self):
+        path = self.write_csv()
+        self.assertGreater(len(run.split_file_ranges(path, 4)), 1)
+
+        expected, expected_daily = run.load_transactions(path)
+        actual, actual_daily = run.load_transactions_parallel(path, 4)
+
+        self.assertEqual(actual, expected)
+        self.assertEqual(plain(actual_daily), plain(expected_daily))
+
+    def test_mixed_encodings(self):
+        path = self.write_csv()
+        # One latin-1 line after a UTF-8 file, as a bank export edited
+        # by hand might end
+        with open(path, "ab") as file:
+            file.write("05 Mar 2025,Café Crème,3.50,EUR,Debit,SETTLED\n"
+                       .encode("latin-1"))
+            file.write("06 Mar 2025,Café Crème,4.20,EUR,Debit,SETTLED\n"
+                       .encode("utf-8"))
+
+        expected, expected_daily = run.load_transactions(path)
+        actual, actual_daily = run.load_transactions_parallel(path, 4)
+
+        self.assertEqual(
+            [t["desc"] for t in expected[-2:]], ["Café Crème"] * 2
+        )
+        self.assertEqual(actual, expected)
+        self.assertEqual(plain(actual_daily), plain(expected_daily))
+
+    def test_carriage_return_only(self):
+        path = self.write_csv()
+        with open(path, "rb") as file:
+            data = file.read()
+        with open(path, "wb") as file:
+            file.write(data.replace(b"\n", b"\r"))
+        self.assertGreater(len(run.split_file_ranges(path, 4)), 1)
+
+        expected, expected_daily = run.load_transactions(path)
+        actual, actual_daily = run.load_transactions_parallel(path, 4)
+
+        self.assertEqual(len(expected), 3000)
+        self.assertEqual(actual, expected)
+        self.assertEqual(plain(actual_daily), plain(expected_daily))
+
+    def test_sample_files(self):
+        for name in ["hsbc_march.csv", "hsbc_april.csv", "hsbc_may.csv"]:
+            with self.subTest(file=name):
+                path = os.path.join(ROOT, name)
+                expected, expected_daily = run.load_transactions(path)
+                actual, actual_daily = run.load_transactions(path, workers=4)
+                self.assertEqual(actual, expected)
+                self.assertEqual(plain(actual_daily), plain(expected_daily))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,212 @@
+"""Check the month sheet format plan and the diff sync"""
+import os
+import sys
+import unittest
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import run  # noqa: E402
+
+
+class FakeSpreadsheet:
+    def __init__(self):
+        self.requests = []
+
+    def batch_update(self, body):
+        self.requests.append(body["requests"])
+
+
+class FakeWorksheet:
+    """In-memory worksheet recording the calls a month write makes"""
+
+    def __init__(self, rows=None):
+        self.id = 7
+        self.rows = [list(row) for row in rows or []]
+        self.row_count = 100
+        self.spreadsheet = FakeSpreadsheet()
+        self.value_updates = []
+
+    def set_cells(self, top_left, values):
+        row, col = run.gspread.utils.a1_to_rowcol(top_left)
+        for r, values_row in enumerate(values):
+            while len(self.rows) < row + r:
+                self.rows.append([])
+            target = self.rows[row + r - 1]
+            for c, value in enumerate(values_row):
+                while len(target) < col + c:
+                    target.append("")
+                target[col + c - 1] = value
+
+    def clear(self):
+        self.rows = []
+
+    def update(self, range_name, values):
+        self.value_updates.append(range_name)
+        self.set_cells(range_name, values)
+
+    def batch_update(self, updates):
+        for update in updates:
+            self.value_updates.append(update["range"])
+            self.set_cells(update["range"].split(":")[0], update["values"])
+
+    def get_values(self, range_name, value_render_option=None):
+        return [list(row) for row in self.rows]
+
+    def add_rows(self, count):
+        self.row_count += count
+
+
+def request_kinds(plan):
+    return Counter(next(iter(request)) for request in plan)
+
+
+def sample_month():
+    transactions, daily_categories = run.load_transactions(
+        os.path.join(ROOT, "hsbc_march.csv")
+    )
+    return transactions, run.analyze(transactions, daily_categories, "march")
+
+
+class MonthSheetFormatPlanTest(unittest.TestCase):
+    def test_plan_size(self):
+        plan = run.month_sheet_format_plan(7, 15, 8, 3)
+        self.assertEqual(
+            request_kinds(plan),
+            {
+                "mergeCells": 3,
+                "repeatCell": 19,
+                "updateDimensionProperties": 10,
+            },
+        )
+
+    def test_plan_without_table_rows(self):
+        plan = run.month_sheet_format_plan(7, 0, 0, 0)
+        self.assertEqual(request_kinds(plan)["repeatCell"], 9)
+        self.assertEqual(len(plan), 22)
+
+    def test_plan_targets_the_sheet_and_table_rows(self):
+        plan = run.month_sheet_format_plan(7, 15, 8, 3)
+        ranges = [
+            next(iter(request.values())).get("range", {})
+            for request in plan
+        ]
+        self.assertTrue(all(grid["sheetId"] == 7 for grid in ranges))
+
+        amounts = run.a1_range_to_grid_range("C8:C22", 7)
+        self.assertIn(amounts, ranges)
+        self.assertNotIn(run.a1_range_to_grid_range("C8:C23", 7), ranges)
+
+    def test_full_write_sends_one_format_batch(self):
+        transactions, data = sample_month()
+        worksheet = FakeWorksheet()
+        get_month_worksheet = run.get_month_worksheet
+        run.get_month_worksheet = lambda month_name: (worksheet, True)
+        try:
+            self.assertTrue(
+                run.write_to_month_sheet("march", transactions, data)
+            )
+        finally:
+            run.get_month_worksheet = get_month_worksheet
+
+        _, counts = run.month_sheet_grid(transactions, data)
+        self.assertEqual(
+            worksheet.spreadsheet.requests,
+            [run.month_sheet_format_plan(7, *counts)],
+        )
+
+
+def apply(current, updates):
+    """Return current with values-update entries applied"""
+    worksheet = FakeWorksheet(current)
+    worksheet.batch_update(updates)
+    return worksheet.rows
+
+
+def filled(grid):
+    """Drop trailing blank cells and rows for comparison"""
+    rows = []
+    for row in grid:
+        row = list(row)
+        while row and row[-1] in ("", None):
+            row.pop()
+        rows.append(row)
+    while rows and not rows[-1]:
+        rows.pop()
+    return rows
+
+
+class ChangedRangesTest(unittest.TestCase):
+    def test_same_grid(self):
+        grid = [["a", 1.5], ["b", 2]]
+        self.assertEqual(run.changed_ranges(grid, grid), [])
+
+    def test_numbers_compare_by_value(self):
+        current = [["Rent", 1200, ""]]
+        desired = [["Rent", 1200.0, None]]
+        self.assertEqual(run.changed_ranges(current, desired), [])
+
+    def test_single_cell(self):
+        current = [["a", "b"], ["c", "d"]]
+        desired = [["a", "b"], ["c", "x"]]
+        self.assertEqual(
+            run.changed_ranges(current, desired),
+            [{"range": "B2:B2", "values": [["x"]]}],
+        )
+
+    def test_runs_on_consecutive_rows_merge(self):
+        current = [["", "", "", ""] for _ in range(3)]
+        desired = [
+            ["", "a", "b", ""],
+            ["", "c", "d", ""],
+            ["e", "", "", ""],
+        ]
+        self.assertEqual(
+            run.changed_ranges(current, desired),
+            [
+                {"range": "B1:C2", "values": [["a", "b"], ["c", "d"]]},
+                {"range": "A3:A3", "values": [["e"]]},
+            ],
+        )
+
+    def test_removed_rows_are_blanked(self):
+        current = [["a", "b"], ["c", "d"], ["e", "f"]]
+        desired = [["a", "b"]]
+        updates = run.changed_ranges(current, desired)
+        self.assertEqual(
+            updates, [{"range": "A2:B3", "values": [["", ""], ["", ""]]}]
+        )
+        self.assertEqual(filled(apply(current, updates)), desired)
+
+    def test_applying_updates_gives_desired_grid(self):
+        transactions, data = sample_month()
+        before, _ = run.month_sheet_grid(transactions[:10], data)
+        after, _ = run.month_sheet_grid(transactions, data)
+        updates = run.changed_ranges(before, after)
+        self.assertEqual(filled(apply(before, updates)), filled(after))
+
+
+class SyncMonthSheetTest(unittest.TestCase):
+    def test_sync_writes_changes_once(self):
+        transactions, data = sample_month()
+        before, _ = run.month_sheet_grid(transactions[:10], data)
+        worksheet = FakeWorksheet(before)
+
+        self.assertTrue(run.sync_month_sheet(worksheet, transactions, data))
+        desired, counts = run.month_sheet_grid(transactions, data)
+        self.assertEqual(filled(worksheet.rows), filled(desired))
+        # The transaction table grew, so the formats are re-sent
+        self.assertEqual(
+            worksheet.spreadsheet.requests,
+            [run.month_sheet_format_plan(7, *counts)],
+        )
+
+        worksheet.value_updates = []
+        self.assertTrue(run.sync_month_sheet(worksheet, transactions, data))
+        self.assertEqual(worksheet.value_updates, [])
+        self.assertEqual(len(worksheet.spreadsheet.requests), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+"""Check merging appended uploads into the stored month state"""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import run  # noqa: E402
+
+
+class MonthStateTest(unittest.TestCase):
+    def setUp(self):
+        self.state_dir = run.MONTH_STATE_DIR
+        run.MONTH_STATE_DIR = tempfile.mkdtemp()
+        self.transactions, self.daily_categories = run.load_transactions(
+            os.path.join(ROOT, "hsbc_march.csv")
+        )
+
+    def tearDown(self):
+        shutil.rmtree(run.MONTH_STATE_DIR, ignore_errors=True)
+        run.MONTH_STATE_DIR = self.state_dir
+
+    def test_append_without_state_is_refused(self):
+        with self.assertRaises(ValueError):
+            run.merge_month_state(
+                "march", self.transactions, self.daily_categories
+            )
+
+    def test_append_after_stored_month(self):
+        first, rest = self.transactions[:5], self.transactions[5:]
+        store = run.TransactionStore.from_transactions(first)
+        data = run.analyze(first, run.defaultdict(dict), "march")
+        self.assertTrue(run.save_month_state("march", store, data))
+
+        merged, merged_data, previous_count = run.merge_month_state(
+            "march", rest, {}
+        )
+        expected = run.analyze(self.transactions, {}, "march")
+        self.assertEqual(previous_count, 5)
+        self.assertEqual(list(merged), self.transactions)
+        self.assertAlmostEqual(merged_data["expenses"], expected["expenses"])
+        self.assertAlmostEqual(merged_data["income"], expected["income"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+"""Check the local output sinks"""
+import csv
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import run  # noqa: E402
+
+MONTHS = ["january", "february", "march", "april", "may", "june"]
+
+
+def write_summary_column(directory, lock_path, month):
+    """Write one month's SUMMARY column from a separate process"""
+    run.SUMMARY_LOCK_PATH = lock_path
+    table_data = [["TOTAL INCOME", MONTHS.index(month) + 1, 1.0]]
+    return run.CsvSink(directory).write_summary(table_data, month)
+
+
+class CsvSinkTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.directory = os.path.join(self.temp_dir, "reports")
+        self.lock_path = os.path.join(self.temp_dir, "summary.lock")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def read_summary(self):
+        path = os.path.join(self.directory, "SUMMARY.csv")
+        with open(path, encoding="utf-8", newline="") as file:
+            return list(csv.reader(file))
+
+    def test_sink_must_write_reports(self):
+        with self.assertRaises(TypeError):
+            run.OutputSink()
+
+    def test_concurrent_summary_columns_are_kept(self):
+        with ProcessPoolExecutor(max_workers=len(MONTHS)) as pool:
+            results = list(
+                pool.map(
+                    write_summary_column,
+                    [self.directory] * len(MONTHS),
+                    [self.lock_path] * len(MONTHS),
+                    MONTHS,
+                )
+            )
+        self.assertTrue(all(results))
+
+        header, totals = self.read_summary()
+        for month in MONTHS:
+            col = header.index(month.capitalize())
+            self.assertEqual(totals[col], str(MONTHS.index(month) + 1))
+        self.assertEqual(len(header), 1 + 2 * len(MONTHS))
+
+    def test_month_layout(self):
+        transactions, daily_categories = run.load_transactions(
+            os.path.join(ROOT, "hsbc_march.csv")
+        )
+        data = run.analyze(transactions, daily_categories, "march")
+        sink = run.CsvSink(self.directory)
+        self.assertTrue(sink.write_month("march", transactions, data))
+
+        path = os.path.join(self.directory, "march.csv")
+        with open(path, encoding="utf-8", newline="") as file:
+            rows = list(csv.reader(file))
+        grid, _ = run.month_sheet_grid(transactions, data)
+        self.assertEqual(len(rows), len(grid))
+
+
+if __name__ == "__main__":
+    unittest.main()
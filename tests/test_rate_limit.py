@@ -0,0 +1,68 @@
+"""Check the back-off of the Sheets rate limiters"""
+import os
+import sys
+import time
+import unittest
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import run  # noqa: E402
+
+
+class FakeResponse:
+    def __init__(self, headers):
+        self.headers = headers
+
+
+def paused_for(bucket):
+    return bucket._paused_until - time.monotonic()
+
+
+class TokenBucketTest(unittest.TestCase):
+    def test_backoff_outlasts_a_quota_window(self):
+        bucket = run.TokenBucket(60)
+        waited = 0.0
+        # Pauses between the attempts of one write
+        for _ in range(run.SHEETS_MAX_RETRIES - 1):
+            bucket.throttle()
+            waited += paused_for(bucket)
+            bucket._paused_until = 0.0
+        self.assertGreaterEqual(waited, bucket.period - 1)
+
+    def test_retry_after_is_honoured(self):
+        bucket = run.TokenBucket(60)
+        bucket.throttle(retry_after=45)
+        self.assertAlmostEqual(paused_for(bucket), 45, delta=1)
+
+    def test_acquire_waits_for_the_pause(self):
+        bucket = run.TokenBucket(600)
+        bucket.throttle(retry_after=0.2)
+        self.assertGreaterEqual(bucket.acquire(), 0.2)
+        bucket.succeeded()
+        self.assertLess(bucket.acquire(), 0.2)
+
+
+class RetryAfterTest(unittest.TestCase):
+    def test_seconds(self):
+        response = FakeResponse({"Retry-After": "30"})
+        self.assertEqual(run.retry_after_seconds(response), 30.0)
+
+    def test_http_date(self):
+        later = datetime.now(timezone.utc) + timedelta(seconds=40)
+        response = FakeResponse({"Retry-After": format_datetime(later)})
+        self.assertAlmostEqual(
+            run.retry_after_seconds(response), 40, delta=2
+        )
+
+    def test_missing_or_invalid(self):
+        self.assertIsNone(run.retry_after_seconds(FakeResponse({})))
+        self.assertIsNone(run.retry_after_seconds(None))
+        response = FakeResponse({"Retry-After": "soon"})
+        self.assertIsNone(run.retry_after_seconds(response))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+"""Check duplicate-upload detection of the operation status store"""
+import io
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import run  # noqa: E402
+
+WINDOW = 600
+
+
+class AttachJobTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = run.StatusStore(
+            os.path.join(self.temp_dir, "status.sqlite3"), 3600
+        )
+        self.heartbeat_interval = run.JOB_HEARTBEAT_INTERVAL
+
+    def tearDown(self):
+        run.JOB_HEARTBEAT_INTERVAL = self.heartbeat_interval
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def attach(self, operation_id):
+        return self.store.attach_job(
+            "March:replace:abc", operation_id, "⏳ Queued", WINDOW
+        )
+
+    def age(self, operation_id, seconds):
+        """Move the last update of an operation into the past"""
+        with sqlite3.connect(self.store.path) as connection:
+            connection.execute(
+                "UPDATE operation_status SET updated = ? "
+                "WHERE operation_id = ?",
+                (time.time() - seconds, operation_id),
+            )
+
+    def updated(self, operation_id):
+        with sqlite3.connect(self.store.path) as connection:
+            return connection.execute(
+                "SELECT updated FROM operation_status "
+                "WHERE operation_id = ?",
+                (operation_id,),
+            ).fetchone()[0]
+
+    def test_running_job_is_followed(self):
+        self.assertEqual(self.attach("op1"), ("op1", False))
+        self.assertEqual(self.attach("op2"), ("op1", True))
+
+    def test_job_without_heartbeat_is_replaced(self):
+        self.attach("op1")
+        self.age("op1", run.JOB_STALE_AFTER + 1)
+        self.assertEqual(self.attach("op2"), ("op2", False))
+        self.assertEqual(self.attach("op3"), ("op2", True))
+
+    def test_recent_success_is_followed(self):
+        self.attach("op1")
+        self.store["op1"] = "✅ Done"
+        self.age("op1", run.JOB_STALE_AFTER + 1)
+        self.assertEqual(self.attach("op2"), ("op1", True))
+
+        self.age("op1", WINDOW + 1)
+        self.assertEqual(self.attach("op3"), ("op3", False))
+
+    def test_failed_job_is_replaced(self):
+        self.attach("op1")
+        self.store["op1"] = "❌ Error"
+        self.assertEqual(self.attach("op2"), ("op2", False))
+
+    def test_heartbeat_keeps_held_jobs_alive(self):
+        run.JOB_HEARTBEAT_INTERVAL = 0.05
+        self.attach("op1")
+        self.age("op1", run.JOB_STALE_AFTER + 1)
+
+        with self.store.keep_alive("op1"):
+            deadline = time.time() + 5
+            while time.time() - self.updated("op1") > 1:
+                self.assertLess(time.time(), deadline)
+                time.sleep(0.05)
+            self.assertEqual(self.attach("op2"), ("op1", True))
+
+        self.assertNotIn("op1", self.store.live)
+        # Let a beat that was already running finish first
+        time.sleep(0.2)
+        self.age("op1", run.JOB_STALE_AFTER + 1)
+        time.sleep(0.2)
+        self.assertEqual(self.attach("op3"), ("op3", False))
+
+
+class DuplicateUploadTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.saved = {
+            name: getattr(run, name)
+            for name in (
+                "OPERATION_STATUS",
+                "SHEET_WRITE_QUEUE",
+                "run_full_analysis_with_file",
+            )
+        }
+        run.OPERATION_STATUS = run.StatusStore(
+            os.path.join(self.temp_dir, "status.sqlite3"), 3600
+        )
+        run.SHEET_WRITE_QUEUE = run.SheetWriteQueue(
+            os.path.join(self.temp_dir, "sheet_writes.sqlite3")
+        )
+        self.started = []
+        self.finish = threading.Event()
+        run.run_full_analysis_with_file = self.fake_analysis
+
+    def tearDown(self):
+        self.finish.set()
+        for name, value in self.saved.items():
+            setattr(run, name, value)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def fake_analysis(self, month, file_path, temp_dir, operation_id, append):
+        self.started.append(operation_id)
+        try:
+            self.finish.wait(5)
+        finally:
+            run.OPERATION_STATUS.release(operation_id)
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def upload(self, month):
+        with open(os.path.join(ROOT, "hsbc_march.csv"), "rb") as file:
+            content = file.read()
+        response = run.app.test_client().post(
+            "/",
+            data={"month": month, "file": (io.BytesIO(content), "x.csv")},
+            content_type="multipart/form-data",
+        )
+        html = response.get_data(as_text=True)
+        return html.split('data-operation-id="')[1].split('"')[0]
+
+    def test_month_spellings_share_a_job(self):
+        first = self.upload("mar")
+        self.assertEqual(self.upload("March"), first)
+        self.assertEqual(self.upload("april"), self.upload("Apr"))
+        self.assertNotEqual(self.upload("april"), first)
+
+
+if __name__ == "__main__":
+    unittest.main()
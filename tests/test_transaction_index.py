@@ -0,0 +1,90 @@
+"""Check de-duplication of re-uploaded transactions"""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import run  # noqa: E402
+
+
+def transaction(date, desc, amount, kind="expense"):
+    return {
+        "date": date,
+        "desc": desc,
+        "amount": amount,
+        "type": kind,
+        "category": "Other",
+    }
+
+
+class TransactionIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.index = run.TransactionIndex(
+            os.path.join(self.temp_dir, "transactions.sqlite3")
+        )
+        self.transactions, _ = run.load_transactions(
+            os.path.join(ROOT, "hsbc_march.csv")
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_reupload_is_dropped(self):
+        new, keys = self.index.filter_new("March", self.transactions)
+        self.assertEqual(new, self.transactions)
+        self.index.add("March", keys)
+
+        new, keys = self.index.filter_new("March", self.transactions)
+        self.assertEqual((new, keys), ([], []))
+
+    def test_nothing_recorded_before_add(self):
+        self.index.filter_new("March", self.transactions)
+        new, _ = self.index.filter_new("March", self.transactions)
+        self.assertEqual(len(new), len(self.transactions))
+
+    def test_overlapping_upload_keeps_only_new_rows(self):
+        first, rest = self.transactions[:10], self.transactions[10:]
+        self.index.add("March", self.index.transaction_keys(first))
+        new, keys = self.index.filter_new("March", self.transactions)
+        self.assertEqual(new, rest)
+        self.assertEqual(keys, self.index.transaction_keys(rest))
+
+    def test_months_are_separate(self):
+        keys = self.index.transaction_keys(self.transactions)
+        self.index.add("March", keys)
+        new, _ = self.index.filter_new("April", self.transactions)
+        self.assertEqual(len(new), len(self.transactions))
+
+    def test_identical_rows_count_separately(self):
+        coffee = transaction("2025-03-03", "Coffee Shop", 3.2)
+        self.index.add("March", self.index.transaction_keys([coffee]))
+
+        new, _ = self.index.filter_new("March", [coffee, dict(coffee)])
+        self.assertEqual(new, [coffee])
+
+    def test_key_normalizes_description_and_sign(self):
+        keys = [
+            self.index.transaction_keys([t])[0]
+            for t in [
+                transaction("2025-03-03", "Coffee  Shop", 3.2),
+                transaction("2025-03-03", "coffee shop", -3.2),
+                transaction("2025-03-03", "coffee shop", 3.2, "income"),
+            ]
+        ]
+        self.assertEqual(keys[0], keys[1])
+        self.assertNotEqual(keys[0], keys[2])
+
+    def test_replace(self):
+        keys = self.index.transaction_keys(self.transactions)
+        self.index.add("March", keys)
+        self.index.replace("March", keys[:5])
+        self.assertEqual(self.index.known_keys("March", keys), set(keys[:5]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+"""Check coalescing, leases and progress of the Sheets write queue"""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import run  # noqa: E402
+
+
+class SheetWriteQueueTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        path = os.path.join(self.temp_dir, "sheet_writes.sqlite3")
+        self.queue = run.SheetWriteQueue(path)
+        # A second worker process sharing the same file
+        self.other = run.SheetWriteQueue(path)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_newer_write_replaces_pending_one(self):
+        self.queue.enqueue("march", "summary", {"table_data": 1}, "op1")
+        replaced = self.queue.enqueue(
+            "march", "summary", {"table_data": 2}, "op2"
+        )
+        self.assertEqual(replaced, "op1")
+
+        job = self.queue.claim()
+        self.assertEqual(job["operation_id"], "op2")
+        self.assertEqual(job["payload"], {"table_data": 2})
+        self.assertIsNone(self.queue.claim())
+
+    def test_pending_full_write_is_not_downgraded(self):
+        self.queue.enqueue("march", "month", {"full": True}, "op1")
+        self.queue.enqueue("march", "month", {"full": False}, "op2")
+        self.assertEqual(self.queue.claim()["payload"], {"full": True})
+
+    def test_newer_version_waits_for_running_write(self):
+        self.queue.enqueue("march", "month", {"full": True}, "op1")
+        running = self.queue.claim()
+        self.other.enqueue("march", "month", {"full": False}, "op2")
+
+        self.assertIsNone(self.other.claim())
+        self.other.enqueue("april", "month", {"full": True}, "op3")
+        self.assertEqual(self.other.claim()["month"], "april")
+
+        self.queue.complete(running)
+        self.queue.release(running)
+        self.assertEqual(self.other.claim()["operation_id"], "op2")
+
+    def test_busy_kinds_are_skipped(self):
+        self.queue.enqueue("march", "month", {"full": True}, "op1")
+        self.queue.enqueue("march", "summary", {"table_data": 1}, "op1")
+        self.assertEqual(self.queue.claim(["month"])["kind"], "summary")
+
+    def test_progress(self):
+        self.assertEqual(self.queue.progress("march"), (0, False))
+        self.queue.confirm("march", month_rows=30)
+        self.queue.confirm("march", summary_synced=1)
+        self.assertEqual(self.queue.progress("march"), (30, True))
+
+        # A new SUMMARY write is not synced until it succeeds
+        self.queue.enqueue("march", "summary", {"table_data": 1}, "op1")
+        self.assertEqual(self.queue.progress("march"), (30, False))
+        self.assertEqual(self.queue.pending("march"), {"summary"})
+
+    def test_give_up_resets_progress(self):
+        self.queue.confirm("march", month_rows=30, summary_synced=1)
+        self.queue.enqueue("march", "month", {"full": False}, "op1")
+        job = self.queue.claim()
+        job["attempts"] = run.WRITE_QUEUE_MAX_ATTEMPTS - 1
+
+        self.assertFalse(self.queue.retry(job))
+        self.assertEqual(self.queue.progress("march"), (0, True))
+        self.assertEqual(self.queue.pending("march"), set())
+
+    def test_retry_delays_the_write(self):
+        self.queue.enqueue("march", "month", {"full": True}, "op1")
+        job = self.queue.claim()
+        self.assertTrue(self.queue.retry(job))
+        self.queue.release(job)
+        self.assertIsNone(self.queue.claim())
+        self.assertEqual(self.queue.pending_kinds("op1"), {"month"})
+
+
+if __name__ == "__main__":
+    unittest.main()